@@ -0,0 +1,170 @@
+"""
+Shared Rust GC library loader for the demo scripts
+
+Importing this module loads libpython_gc once per process and declares the
+prototype of every entry point the demos call. Later imports are served from
+sys.modules, so scripts that run together share one handle.
+"""
+
+import ctypes
+import os
+
+# Load the Rust GC library. RTLD_NOW resolves every symbol at load time, so
+# the first call into each entry point does not pay for lazy binding in the
+# middle of a timed loop. The path is absolute, so dlopen opens it directly
+# instead of walking the library search path, and errno/last-error
+# snapshotting is spelled out as off: no entry point reports through errno.
+lib_path = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', 'target', 'release')
+)
+_load_options = {
+    'mode': os.RTLD_NOW | os.RTLD_LOCAL,
+    'use_errno': False,
+    'use_last_error': False,
+}
+
+try:
+    lib = ctypes.CDLL(os.path.join(lib_path, 'libpython_gc.so'), **_load_options)
+except OSError:
+    try:
+        lib = ctypes.CDLL(os.path.join(lib_path, 'libpython_gc.dylib'), **_load_options)
+    except OSError:
+        # An ImportError rather than an exit, so an importer that can do
+        # without the library gets to decide what happens next
+        raise ImportError(f"Could not load libpython_gc library from {lib_path}") from None
+
+# Return codes
+GC_SUCCESS = 0
+GC_ERROR_ALREADY_TRACKED = -1
+GC_ERROR_NOT_TRACKED = -2
+GC_ERROR_COLLECTION_IN_PROGRESS = -3
+GC_ERROR_INVALID_GENERATION = -4
+GC_ERROR_INTERNAL = -5
+
+# py_gc_self_test steps, in the bit order of the mask it reports
+SELF_TEST_STEPS = (
+    "GC initialization",
+    "GC enable",
+    "Basic collection",
+    "Generation 0 collection",
+    "Generation 1 collection",
+    "Generation 2 collection",
+    "Statistics retrieval",
+    "Threshold management",
+    "State string",
+    "Collect if needed",
+    "Debug state",
+    "GC cleanup",
+)
+
+class GCError(RuntimeError):
+    """Raised when a status-returning GC entry point reports a failure"""
+
+    def __init__(self, func, code):
+        super().__init__(f"{func} failed with status {code}")
+        self.func = func
+        self.code = code
+
+def _chk(result, func, args):
+    """errcheck hook: turn a non-zero GCReturnCode into GCError"""
+    if result:
+        raise GCError(func.__name__, result)
+    return result
+
+# GC statistics structure
+class GCStats(ctypes.Structure):
+    _fields_ = [
+        ("total_tracked", ctypes.c_int32),
+        ("generation_counts", ctypes.c_int32 * 3),
+        ("uncollectable", ctypes.c_int32)
+    ]
+
+# GC state snapshot structure
+class GCState(ctypes.Structure):
+    _fields_ = [
+        ("enabled", ctypes.c_int32),
+        ("total_tracked", ctypes.c_int32),
+        ("generation_counts", ctypes.c_int32 * 3),
+        ("uncollectable", ctypes.c_int32),
+        ("thresholds", ctypes.c_int32 * 3)
+    ]
+
+# Fixed prototypes for every entry point the demos use, as (name, restype,
+# argtypes). With argtypes declared, ctypes skips its per-call type guessing
+# and passes object ids as full-width pointers instead of truncating them to
+# a C int. Applying them here also creates and caches each function object at
+# import, before any demo starts timing.
+#
+# Entries declared with _status return a GCReturnCode and get _chk as their
+# errcheck, so callers no longer compare every result against GC_SUCCESS; a
+# failure surfaces as GCError instead. Entries that return a value (counts,
+# flags, sizes) keep a plain c_int32 result.
+_obj = ctypes.c_void_p
+_status = object()
+_decls = (
+    ("py_gc_init", _status, ()),
+    ("py_gc_cleanup", _status, ()),
+    ("py_gc_enable", _status, ()),
+    ("py_gc_disable", _status, ()),
+    ("py_gc_is_enabled", ctypes.c_int32, ()),
+    ("py_gc_is_initialized", ctypes.c_int32, ()),
+    ("py_gc_collect", _status, ()),
+    ("py_gc_collect_generation", _status, (ctypes.c_int32,)),
+    ("py_gc_collect_generation_count", _status,
+     (ctypes.c_int32, ctypes.POINTER(ctypes.c_size_t))),
+    ("py_gc_collect_all_gens_timed", _status, (ctypes.POINTER(ctypes.c_uint64),)),
+    ("py_gc_collect_if_needed", _status, ()),
+    ("py_gc_collect_step", ctypes.c_int32, (ctypes.c_uint64,)),
+    ("py_gc_set_incremental_budget", _status, (ctypes.c_int32,)),
+    ("py_gc_needs_collection", ctypes.c_int32, ()),
+    ("py_gc_debug_state", _status, ()),
+    ("py_gc_self_test", _status, (ctypes.POINTER(ctypes.c_uint32),)),
+    ("py_gc_get_stats", _status, (ctypes.POINTER(GCStats),)),
+    ("py_gc_get_state", _status, (ctypes.POINTER(GCState),)),
+    ("py_gc_get_collection_counts_into", _status, (ctypes.POINTER(ctypes.c_int32),)),
+    ("py_gc_set_threshold", _status, (ctypes.c_int32, ctypes.c_int32)),
+    ("py_gc_get_threshold", ctypes.c_int32, (ctypes.c_int32,)),
+    ("py_gc_set_thresholds", _status, (ctypes.c_int32, ctypes.c_int32, ctypes.c_int32)),
+    ("py_gc_get_thresholds", _status, (ctypes.POINTER(ctypes.c_int32),)),
+    ("py_gc_get_registry_count", ctypes.c_int32, ()),
+    ("py_gc_get_state_string", _status, (ctypes.c_char_p, ctypes.c_size_t)),
+    ("py_gc_set_debug_flags", _status, (ctypes.c_int32,)),
+    ("py_gc_get_debug_flags", ctypes.c_int32, ()),
+    ("py_gc_enable_automatic_tracking", _status, ()),
+    ("py_gc_disable_automatic_tracking", _status, ()),
+    ("py_gc_is_automatic_tracking_enabled", ctypes.c_int32, ()),
+    ("py_gc_state_version", ctypes.c_uint64, ()),
+    ("py_gc_track", _status, (_obj,)),
+    ("py_gc_untrack", _status, (_obj,)),
+    ("py_gc_is_tracked", ctypes.c_int32, (_obj,)),
+    ("py_gc_track_many", _status, (ctypes.POINTER(_obj), ctypes.c_size_t)),
+    ("py_gc_untrack_many", _status, (ctypes.POINTER(_obj), ctypes.c_size_t)),
+    ("py_gc_track_python", _status, (_obj,)),
+    ("py_gc_untrack_python", _status, (_obj,)),
+    ("py_gc_is_tracked_python", ctypes.c_int32, (_obj,)),
+    ("py_gc_track_python_many", _status, (ctypes.POINTER(_obj), ctypes.c_size_t)),
+    ("py_gc_untrack_python_many", _status, (ctypes.POINTER(_obj), ctypes.c_size_t)),
+    ("py_gc_is_tracked_python_many", _status,
+     (ctypes.POINTER(_obj), ctypes.c_size_t, ctypes.POINTER(ctypes.c_uint8))),
+    ("py_gc_get_tracked_info", _status, (_obj, ctypes.c_char_p, ctypes.c_size_t)),
+    ("py_gc_get_object_type_name", _status, (_obj, ctypes.c_char_p, ctypes.c_size_t)),
+    ("py_gc_get_object_size", ctypes.c_int32, (_obj,)),
+    ("py_gc_set_finalizer", _status, (_obj, ctypes.c_int32)),
+    ("py_gc_has_finalizer", ctypes.c_int32, (_obj,)),
+    ("py_gc_set_refcount", _status, (_obj, ctypes.c_int32)),
+    ("py_gc_get_refcount", ctypes.c_int32, (_obj,)),
+)
+
+for _name, _restype, _argtypes in _decls:
+    _fn = getattr(lib, _name)
+    if _restype is _status:
+        _fn.restype = ctypes.c_int32
+        _fn.errcheck = _chk
+    else:
+        _fn.restype = _restype
+    _fn.argtypes = _argtypes
+
+# The library's exported copy of py_gc_needs_collection(). Reading .value is
+# a plain memory load through a cached pointer, so polling it skips the FFI
+# call entirely.
+needs_collection_flag = ctypes.c_int32.in_dll(lib, "PY_GC_NEEDS_COLLECTION")
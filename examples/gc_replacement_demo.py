@@ -1,32 +1,81 @@
 #!/usr/bin/env python3
 import ctypes
+import functools
+import struct
 import sys
 import os
-import weakref
 import threading
-from typing import List, Optional, Tuple, Any, Dict, Set
 import atexit
 
-# Load the Rust GC library
-lib_path = os.path.join(os.path.dirname(__file__), '..', 'target', 'release')
-sys.path.insert(0, lib_path)
-
-try:
-    lib = ctypes.CDLL(os.path.join(lib_path, 'libpython_gc.so'))
-except OSError:
+def _load_lib():
+    """Import the shared Rust GC loader, or return None if it cannot load"""
     try:
-        lib = ctypes.CDLL(os.path.join(lib_path, 'libpython_gc.dylib'))
-    except OSError:
-        print("Error: Could not load libpython_gc library")
-        sys.exit(1)
-
-# Return codes
-GC_SUCCESS = 0
-GC_ERROR_ALREADY_TRACKED = -1
-GC_ERROR_NOT_TRACKED = -2
-GC_ERROR_COLLECTION_IN_PROGRESS = -3
-GC_ERROR_INVALID_GENERATION = -4
-GC_ERROR_INTERNAL = -5
+        import _gc_lib
+    except ImportError:
+        return None
+    return _gc_lib
+
+class _MissingLib:
+    """Stands in for lib when the Rust library is unavailable"""
+    
+    def __getattr__(self, name):
+        def unavailable(*args):
+            raise RuntimeError("Rust GC library is not available")
+        return unavailable
+
+# The shared loader opens the library once and declares the prototype of
+# every entry point, so each call below marshals its arguments through a
+# fixed signature; status-returning calls raise GCError on failure. If the
+# library cannot be loaded, importing this module still succeeds: the names
+# gc itself provides fall back to the interpreter's collector (see the end
+# of the module), and the Rust-only extras raise RuntimeError.
+_native = _load_lib()
+if _native is not None:
+    lib = _native.lib
+    GCError = _native.GCError
+    GCStats = _native.GCStats
+    GCState = _native.GCState
+    needs_collection_flag = _native.needs_collection_flag
+else:
+    lib = _MissingLib()
+    GCError = RuntimeError
+    GCStats = None
+    GCState = None
+    needs_collection_flag = ctypes.c_int32(0)
+
+# Entry points bound once at import, so each call below loads a module
+# global (or a default argument) instead of looking the function up on lib.
+_py_gc_init = lib.py_gc_init
+_py_gc_cleanup = lib.py_gc_cleanup
+_py_gc_enable = lib.py_gc_enable
+_py_gc_disable = lib.py_gc_disable
+_py_gc_is_enabled = lib.py_gc_is_enabled
+_py_gc_enable_automatic_tracking = lib.py_gc_enable_automatic_tracking
+_py_gc_disable_automatic_tracking = lib.py_gc_disable_automatic_tracking
+_py_gc_is_automatic_tracking_enabled = lib.py_gc_is_automatic_tracking_enabled
+_py_gc_collect_generation_count = lib.py_gc_collect_generation_count
+_py_gc_collect_if_needed = lib.py_gc_collect_if_needed
+_py_gc_get_state = lib.py_gc_get_state
+_py_gc_get_stats = lib.py_gc_get_stats
+_py_gc_set_threshold = lib.py_gc_set_threshold
+_py_gc_get_threshold = lib.py_gc_get_threshold
+_py_gc_set_debug_flags = lib.py_gc_set_debug_flags
+_py_gc_get_debug_flags = lib.py_gc_get_debug_flags
+_py_gc_is_tracked_python = lib.py_gc_is_tracked_python
+_py_gc_track_python = lib.py_gc_track_python
+_py_gc_untrack_python = lib.py_gc_untrack_python
+_py_gc_track_python_many = lib.py_gc_track_python_many
+_py_gc_untrack_python_many = lib.py_gc_untrack_python_many
+_py_gc_is_tracked_python_many = lib.py_gc_is_tracked_python_many
+_py_gc_get_tracked_info = lib.py_gc_get_tracked_info
+_py_gc_get_object_size = lib.py_gc_get_object_size
+_py_gc_get_object_type_name = lib.py_gc_get_object_type_name
+_py_gc_has_finalizer = lib.py_gc_has_finalizer
+_py_gc_set_finalizer = lib.py_gc_set_finalizer
+_py_gc_get_refcount = lib.py_gc_get_refcount
+_py_gc_set_refcount = lib.py_gc_set_refcount
+_py_gc_get_state_string = lib.py_gc_get_state_string
+_py_gc_debug_state = lib.py_gc_debug_state
 
 # Debug flags (matching Python's gc module)
 DEBUG_STATS = 1
@@ -37,13 +86,34 @@ DEBUG_OBJECTS = 16
 DEBUG_SAVEALL = 32
 DEBUG_LEAK = 64
 
-# GC statistics structure
-class GCStats(ctypes.Structure):
-    _fields_ = [
-        ("total_tracked", ctypes.c_int32),
-        ("generation_counts", ctypes.c_int32 * 3),
-        ("uncollectable", ctypes.c_int32)
-    ]
+# Per-generation entry points with the generation already bound, keyed by
+# every generation argument the API accepts (None is a full collection, which
+# is a generation 2 collection). One lookup both validates the argument and
+# picks the call; a dict rather than a tuple, so -1 is rejected instead of
+# wrapping around to generation 2.
+_COLLECT = {
+    gen: functools.partial(_py_gc_collect_generation_count, 2 if gen is None else gen)
+    for gen in (None, 0, 1, 2)
+}
+_SET_THRESHOLD = {gen: functools.partial(_py_gc_set_threshold, gen) for gen in range(3)}
+_GET_THRESHOLD = {gen: functools.partial(_py_gc_get_threshold, gen) for gen in range(3)}
+
+# Per-thread out-buffers for the string and stats queries. Each is built on
+# a thread's first query and reused after that; every result is decoded
+# before the call returns, so reusing one is safe within its thread.
+_TLS = threading.local()
+
+# GCStats unpacked in one C-level call: total_tracked, the three generation
+# counts and uncollectable, as five native int32s with no padding
+_STATS_LAYOUT = struct.Struct('=5i')
+
+def _tls_buffer(name, size):
+    """Return this thread's reusable char buffer called name"""
+    buffer = getattr(_TLS, name, None)
+    if buffer is None:
+        buffer = (ctypes.c_char * size)()
+        setattr(_TLS, name, buffer)
+    return buffer
 
 class PythonGCReplacement:
     """
@@ -58,105 +128,129 @@ class PythonGCReplacement:
         self._enabled = False
         self._automatic_tracking = False
         self._debug_flags = 0
-        self._garbage = []
-        self._callbacks = []
-        self._lock = threading.RLock()
+        # Replaced whole, never mutated, so readers can hand them out, or
+        # iterate them, without the lock
+        self._garbage = ()
+        self._callbacks = ()
+        # Taken by writers only. Every query reads attributes or calls a
+        # read-only entry point, and a single attribute load is atomic under
+        # the GIL, so readers never wait on it; writers publish new state by
+        # plain assignment. Writers test _initialized once before taking
+        # it and again inside: a stale read only costs a wasted acquire or
+        # skips work the locked check would have refused anyway.
+        self._lock = threading.Lock()
         
-        # Initialize the GC
-        self._init_gc()
+        # Initialize the GC. Without the library the instance stays
+        # uninitialized, so its queries return defaults and its writers raise
+        if _native is not None:
+            self._init_gc()
         
-        # Register cleanup on exit
+        # Register cleanup on exit. A forked child inherits a copy of the
+        # library state that belongs to the parent, so it forgets it rather
+        # than cleaning it up a second time at its own exit.
         atexit.register(self._cleanup)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork_in_child)
     
     def _init_gc(self):
         """Initialize the garbage collector"""
+        if self._initialized:
+            return
+        
         with self._lock:
             if self._initialized:
                 return
             
-            result = lib.py_gc_init()
-            if result == GC_SUCCESS:
-                self._initialized = True
-                self._enabled = True
-                print("✓ Rust GC initialized successfully")
-            else:
-                raise RuntimeError(f"Failed to initialize Rust GC: {result}")
+            _py_gc_init()
+            self._initialized = True
+            self._enabled = True
     
     def _cleanup(self):
         """Clean up the garbage collector"""
+        if not self._initialized:
+            return
+        
         with self._lock:
             if not self._initialized:
                 return
             
-            result = lib.py_gc_cleanup()
-            if result == GC_SUCCESS:
-                self._initialized = False
-                self._enabled = False
-                print("✓ Rust GC cleaned up successfully")
-            else:
-                print(f"Warning: Rust GC cleanup failed: {result}")
+            try:
+                _py_gc_cleanup()
+            except GCError as e:
+                sys.stderr.write(f"Warning: Rust GC cleanup failed: {e.code}\n")
+                return
+            self._initialized = False
+            self._enabled = False
+            if self._debug_flags & DEBUG_STATS:
+                sys.stderr.write("✓ Rust GC cleaned up successfully\n")
+    
+    def _after_fork_in_child(self):
+        """Drop the parent's GC state in a freshly forked child"""
+        # The lock may have been held by a parent thread that does not exist
+        # here, so the child starts with a new one
+        self._lock = threading.Lock()
+        self._initialized = False
+        self._enabled = False
     
     def enable(self):
         """Enable automatic garbage collection"""
+        if not self._initialized:
+            raise RuntimeError("GC not initialized")
+        
         with self._lock:
             if not self._initialized:
                 raise RuntimeError("GC not initialized")
             
-            result = lib.py_gc_enable()
-            if result == GC_SUCCESS:
-                self._enabled = True
-            else:
-                raise RuntimeError(f"Failed to enable GC: {result}")
+            _py_gc_enable()
+            self._enabled = True
     
     def disable(self):
         """Disable automatic garbage collection"""
+        if not self._initialized:
+            raise RuntimeError("GC not initialized")
+        
         with self._lock:
             if not self._initialized:
                 raise RuntimeError("GC not initialized")
             
-            result = lib.py_gc_disable()
-            if result == GC_SUCCESS:
-                self._enabled = False
-            else:
-                raise RuntimeError(f"Failed to disable GC: {result}")
+            _py_gc_disable()
+            self._enabled = False
     
     def isenabled(self):
         """Check if automatic collection is enabled"""
-        with self._lock:
-            if not self._initialized:
-                return False
-            return bool(lib.py_gc_is_enabled())
+        if not self._initialized:
+            return False
+        return bool(_py_gc_is_enabled())
     
     def enable_automatic_tracking(self):
         """Enable automatic tracking of Python objects"""
+        if not self._initialized:
+            raise RuntimeError("GC not initialized")
+        
         with self._lock:
             if not self._initialized:
                 raise RuntimeError("GC not initialized")
             
-            result = lib.py_gc_enable_automatic_tracking()
-            if result == GC_SUCCESS:
-                self._automatic_tracking = True
-            else:
-                raise RuntimeError(f"Failed to enable automatic tracking: {result}")
+            _py_gc_enable_automatic_tracking()
+            self._automatic_tracking = True
     
     def disable_automatic_tracking(self):
         """Disable automatic tracking of Python objects"""
+        if not self._initialized:
+            raise RuntimeError("GC not initialized")
+        
         with self._lock:
             if not self._initialized:
                 raise RuntimeError("GC not initialized")
             
-            result = lib.py_gc_disable_automatic_tracking()
-            if result == GC_SUCCESS:
-                self._automatic_tracking = False
-            else:
-                raise RuntimeError(f"Failed to disable automatic tracking: {result}")
+            _py_gc_disable_automatic_tracking()
+            self._automatic_tracking = False
     
     def is_automatic_tracking_enabled(self):
         """Check if automatic tracking is enabled"""
-        with self._lock:
-            if not self._initialized:
-                return False
-            return bool(lib.py_gc_is_automatic_tracking_enabled())
+        if not self._initialized:
+            return False
+        return bool(_py_gc_is_automatic_tracking_enabled())
     
     def collect(self, generation=None):
         """
@@ -168,35 +262,41 @@ class PythonGCReplacement:
         Returns:
             Number of objects collected
         """
+        if not self._initialized:
+            raise RuntimeError("GC not initialized")
+        
         with self._lock:
             if not self._initialized:
                 raise RuntimeError("GC not initialized")
             
-            if generation is not None:
-                if not 0 <= generation <= 2:
-                    raise ValueError("Generation must be 0, 1, or 2")
-                result = lib.py_gc_collect_generation(generation)
-            else:
-                result = lib.py_gc_collect()
+            try:
+                collect_generation = _COLLECT[generation]
+            except KeyError:
+                raise ValueError("Generation must be 0, 1, or 2") from None
             
-            if result == GC_SUCCESS:
-                # Get the number of objects collected
-                stats = self.get_stats()
-                return stats['total_tracked'] if stats else 0
-            else:
-                raise RuntimeError(f"Collection failed: {result}")
+            # The library reports the collected count through an out-param,
+            # so no follow-up stats query is needed to return it
+            collected = ctypes.c_size_t()
+            collect_generation(ctypes.byref(collected))
+            return collected.value
     
     def collect_if_needed(self):
         """Collect if thresholds are exceeded"""
+        if not self._initialized:
+            raise RuntimeError("GC not initialized")
+        
+        # The library's exported flag says whether a threshold is crossed;
+        # reading it is a memory load, so the common nothing-to-do case
+        # costs no lock and no FFI call
+        if not needs_collection_flag.value:
+            return True
+        
         with self._lock:
             if not self._initialized:
                 raise RuntimeError("GC not initialized")
             
-            result = lib.py_gc_collect_if_needed()
-            if result == GC_SUCCESS:
-                return True
-            else:
-                raise RuntimeError(f"Collection failed: {result}")
+            _py_gc_collect_if_needed()
+            return True
     
     def get_count(self):
         """
@@ -205,110 +305,163 @@ class PythonGCReplacement:
         Returns:
             Tuple of (count0, count1, count2)
         """
-        with self._lock:
-            if not self._initialized:
-                return (0, 0, 0)
-            
-            counts_ptr = lib.py_gc_get_collection_counts()
-            if counts_ptr:
-                try:
-                    counts = ctypes.cast(counts_ptr, ctypes.POINTER(ctypes.c_int * 3)).contents
-                    return tuple(counts)
-                finally:
-                    lib.py_gc_free_collection_counts(counts_ptr)
-            else:
-                return (0, 0, 0)
+        if not self._initialized:
+            return (0, 0, 0)
+        
+        # One call filling this thread's state struct, instead of fetching a
+        # library-allocated array and freeing it again
+        state = getattr(_TLS, 'state', None)
+        if state is None:
+            state = _TLS.state = GCState()
+        try:
+            _py_gc_get_state(state)
+        except GCError:
+            return (0, 0, 0)
+        counts = state.generation_counts
+        return (counts[0], counts[1], counts[2])
     
     def get_stats(self):
         """Get garbage collection statistics"""
-        with self._lock:
-            if not self._initialized:
-                return None
-            
-            stats = GCStats()
-            result = lib.py_gc_get_stats(ctypes.byref(stats))
-            if result == GC_SUCCESS:
-                return {
-                    'total_tracked': stats.total_tracked,
-                    'generation_counts': list(stats.generation_counts),
-                    'uncollectable': stats.uncollectable
-                }
+        if not self._initialized:
             return None
+        
+        stats = getattr(_TLS, 'stats', None)
+        if stats is None:
+            stats = _TLS.stats = GCStats()
+        try:
+            _py_gc_get_stats(stats)
+        except GCError:
+            return None
+        # Read the filled struct as raw bytes rather than through its
+        # per-field descriptors
+        total, gen0, gen1, gen2, uncollectable = _STATS_LAYOUT.unpack_from(stats)
+        return {
+            'total_tracked': total,
+            'generation_counts': [gen0, gen1, gen2],
+            'uncollectable': uncollectable
+        }
     
     def set_threshold(self, generation, threshold):
         """Set threshold for a generation"""
+        if not self._initialized:
+            raise RuntimeError("GC not initialized")
+        
         with self._lock:
             if not self._initialized:
                 raise RuntimeError("GC not initialized")
             
-            if not 0 <= generation <= 2:
-                raise ValueError("Generation must be 0, 1, or 2")
+            try:
+                set_generation_threshold = _SET_THRESHOLD[generation]
+            except KeyError:
+                raise ValueError("Generation must be 0, 1, or 2") from None
             
-            result = lib.py_gc_set_threshold(generation, threshold)
-            if result != GC_SUCCESS:
-                raise RuntimeError(f"Failed to set threshold: {result}")
+            set_generation_threshold(threshold)
     
     def get_threshold(self, generation):
         """Get threshold for a generation"""
-        with self._lock:
-            if not self._initialized:
-                return 0
-            
-            if not 0 <= generation <= 2:
-                raise ValueError("Generation must be 0, 1, or 2")
-            
-            threshold = lib.py_gc_get_threshold(generation)
-            return threshold if threshold >= 0 else 0
+        if not self._initialized:
+            return 0
+        
+        try:
+            get_generation_threshold = _GET_THRESHOLD[generation]
+        except KeyError:
+            raise ValueError("Generation must be 0, 1, or 2") from None
+        
+        threshold = get_generation_threshold()
+        return threshold if threshold >= 0 else 0
     
     def set_debug(self, flags):
         """Set debug flags"""
+        if not self._initialized:
+            raise RuntimeError("GC not initialized")
+        
         with self._lock:
             if not self._initialized:
                 raise RuntimeError("GC not initialized")
             
-            result = lib.py_gc_set_debug_flags(flags)
-            if result == GC_SUCCESS:
-                self._debug_flags = flags
-            else:
-                raise RuntimeError(f"Failed to set debug flags: {result}")
+            _py_gc_set_debug_flags(flags)
+            self._debug_flags = flags
     
     def get_debug(self):
         """Get current debug flags"""
+        if not self._initialized:
+            return 0
+        return _py_gc_get_debug_flags()
+    
+    # The per-object methods below take id and their entry point as
+    # default arguments: both are bound once, when the class is defined, and
+    # each call then loads them as fast locals instead of looking up a
+    # global and an attribute on lib. They are not meant to be passed.
+    
+    def is_tracked(self, obj, _id=id, _fn=_py_gc_is_tracked_python):
+        """Check if an object is tracked by the garbage collector"""
+        if not self._initialized:
+            return False
+        return _fn(_id(obj)) != 0
+    
+    def track(self, obj, _id=id, _fn=_py_gc_track_python):
+        """Track an object for garbage collection"""
+        if not self._initialized:
+            raise RuntimeError("GC not initialized")
+        
         with self._lock:
             if not self._initialized:
-                return 0
-            return lib.py_gc_get_debug_flags()
+                raise RuntimeError("GC not initialized")
+            
+            _fn(_id(obj))
     
-    def is_tracked(self, obj):
-        """Check if an object is tracked by the garbage collector"""
+    def untrack(self, obj, _id=id, _fn=_py_gc_untrack_python):
+        """Stop tracking an object"""
+        if not self._initialized:
+            raise RuntimeError("GC not initialized")
+        
         with self._lock:
             if not self._initialized:
-                return False
+                raise RuntimeError("GC not initialized")
             
-            obj_ptr = id(obj)
-            return bool(lib.py_gc_is_tracked_python(obj_ptr))
+            _fn(_id(obj))
     
-    def track(self, obj):
-        """Track an object for garbage collection"""
+    def track_many(self, objects):
+        """Track a batch of objects with a single library call"""
+        if not self._initialized:
+            raise RuntimeError("GC not initialized")
+        
+        objects = list(objects)
+        ptrs = (ctypes.c_void_p * len(objects))(*map(id, objects))
         with self._lock:
             if not self._initialized:
                 raise RuntimeError("GC not initialized")
             
-            obj_ptr = id(obj)
-            result = lib.py_gc_track_python(obj_ptr)
-            if result != GC_SUCCESS:
-                raise RuntimeError(f"Failed to track object: {result}")
+            _py_gc_track_python_many(ptrs, len(ptrs))
     
-    def untrack(self, obj):
-        """Stop tracking an object"""
+    def untrack_many(self, objects):
+        """Stop tracking a batch of objects with a single library call"""
+        if not self._initialized:
+            raise RuntimeError("GC not initialized")
+        
+        objects = list(objects)
+        ptrs = (ctypes.c_void_p * len(objects))(*map(id, objects))
         with self._lock:
             if not self._initialized:
                 raise RuntimeError("GC not initialized")
             
-            obj_ptr = id(obj)
-            result = lib.py_gc_untrack_python(obj_ptr)
-            if result != GC_SUCCESS:
-                raise RuntimeError(f"Failed to untrack object: {result}")
+            _py_gc_untrack_python_many(ptrs, len(ptrs))
+    
+    def is_tracked_many(self, objects):
+        """
+        Check a batch of objects with a single library call.
+        
+        Returns:
+            bytes with one 0/1 flag per object, in order
+        """
+        objects = list(objects)
+        if not self._initialized:
+            return bytes(len(objects))
+        
+        ptrs = (ctypes.c_void_p * len(objects))(*map(id, objects))
+        flags = (ctypes.c_uint8 * len(objects))()
+        _py_gc_is_tracked_python_many(ptrs, len(ptrs), flags)
+        return bytes(flags)
     
     def get_objects(self):
         """
@@ -317,14 +470,13 @@ class PythonGCReplacement:
         Note: This is a placeholder implementation.
         In a full implementation, this would return actual Python objects.
         """
-        with self._lock:
-            if not self._initialized:
-                return []
-            
-            # For now, return an empty list
-            # In a full implementation, this would query the Rust GC
-            # and convert the tracked objects back to Python objects
+        if not self._initialized:
             return []
+        
+        # For now, return an empty list
+        # In a full implementation, this would query the Rust GC
+        # and convert the tracked objects back to Python objects
+        return []
     
     def get_referrers(self, obj):
         """
@@ -332,14 +484,13 @@ class PythonGCReplacement:
         
         Note: This is a placeholder implementation.
         """
-        with self._lock:
-            if not self._initialized:
-                return []
-            
-            # For now, return an empty list
-            # In a full implementation, this would query the Rust GC
-            # for objects that reference the given object
+        if not self._initialized:
             return []
+        
+        # For now, return an empty list
+        # In a full implementation, this would query the Rust GC
+        # for objects that reference the given object
+        return []
     
     def get_referents(self, obj):
         """
@@ -347,162 +498,161 @@ class PythonGCReplacement:
         
         Note: This is a placeholder implementation.
         """
-        with self._lock:
-            if not self._initialized:
-                return []
-            
-            # For now, return an empty list
-            # In a full implementation, this would query the Rust GC
-            # for objects referenced by the given object
+        if not self._initialized:
             return []
+        
+        # For now, return an empty list
+        # In a full implementation, this would query the Rust GC
+        # for objects referenced by the given object
+        return []
     
     def get_garbage(self):
-        """Get uncollectable objects"""
-        with self._lock:
-            return self._garbage.copy()
+        """Get uncollectable objects, as an immutable snapshot"""
+        return self._garbage
     
     def set_garbage(self, garbage_list):
         """Set the list of uncollectable objects"""
+        garbage = tuple(garbage_list) if garbage_list else ()
         with self._lock:
-            self._garbage = list(garbage_list) if garbage_list else []
+            self._garbage = garbage
     
     def clear_garbage(self):
         """Clear the list of uncollectable objects"""
         with self._lock:
-            self._garbage.clear()
+            self._garbage = ()
     
     def add_callback(self, callback):
         """Add a callback to be called before collection"""
         with self._lock:
             if callback not in self._callbacks:
-                self._callbacks.append(callback)
+                self._callbacks = self._callbacks + (callback,)
     
     def remove_callback(self, callback):
         """Remove a callback"""
         with self._lock:
             if callback in self._callbacks:
-                self._callbacks.remove(callback)
+                # Compared by equality, as list.remove would: a bound method
+                # fetched again is equal to, but not the same object as, the
+                # one that was registered
+                self._callbacks = tuple(
+                    cb for cb in self._callbacks if cb != callback
+                )
     
     def callbacks(self):
-        """Get all registered callbacks"""
-        with self._lock:
-            return self._callbacks.copy()
+        """Get all registered callbacks, as an immutable snapshot"""
+        return self._callbacks
     
-    def get_object_info(self, obj):
+    def get_object_info(self, obj, _id=id, _fn=_py_gc_get_tracked_info):
         """Get detailed information about a tracked object"""
-        with self._lock:
-            if not self._initialized:
-                return None
-            
-            obj_ptr = id(obj)
-            buffer = ctypes.create_string_buffer(256)
-            result = lib.py_gc_get_tracked_info(obj_ptr, buffer, 256)
-            
-            if result == GC_SUCCESS:
-                return buffer.value.decode('utf-8')
-            else:
-                return None
+        if not self._initialized:
+            return None
+        
+        buffer = _tls_buffer('text', 256)
+        try:
+            _fn(_id(obj), buffer, 256)
+        except GCError:
+            return None
+        return buffer.value.decode('utf-8')
     
-    def get_object_size(self, obj):
+    def get_object_size(self, obj, _id=id, _fn=_py_gc_get_object_size):
         """Get the size of a tracked object in bytes"""
-        with self._lock:
-            if not self._initialized:
-                return 0
-            
-            obj_ptr = id(obj)
-            return lib.py_gc_get_object_size(obj_ptr)
+        if not self._initialized:
+            return 0
+        return _fn(_id(obj))
     
-    def get_object_type(self, obj):
+    def get_object_type(self, obj, _id=id, _fn=_py_gc_get_object_type_name):
         """Get the type name of a tracked object"""
-        with self._lock:
-            if not self._initialized:
-                return "unknown"
-            
-            obj_ptr = id(obj)
-            buffer = ctypes.create_string_buffer(64)
-            result = lib.py_gc_get_object_type_name(obj_ptr, buffer, 64)
-            
-            if result == GC_SUCCESS:
-                return buffer.value.decode('utf-8')
-            else:
-                return "unknown"
-    
-    def has_finalizer(self, obj):
+        if not self._initialized:
+            return "unknown"
+        
+        buffer = _tls_buffer('type_name', 64)
+        try:
+            _fn(_id(obj), buffer, 64)
+        except GCError:
+            return "unknown"
+        return buffer.value.decode('utf-8')
+    
+    def has_finalizer(self, obj, _id=id, _fn=_py_gc_has_finalizer):
         """Check if an object has a finalizer"""
-        with self._lock:
-            if not self._initialized:
-                return False
-            
-            obj_ptr = id(obj)
-            return bool(lib.py_gc_has_finalizer(obj_ptr))
+        if not self._initialized:
+            return False
+        return _fn(_id(obj)) != 0
     
-    def set_finalizer(self, obj, has_finalizer):
+    def set_finalizer(self, obj, has_finalizer, _id=id, _fn=_py_gc_set_finalizer):
         """Set whether an object has a finalizer"""
+        if not self._initialized:
+            raise RuntimeError("GC not initialized")
+        
         with self._lock:
             if not self._initialized:
                 raise RuntimeError("GC not initialized")
             
-            obj_ptr = id(obj)
-            result = lib.py_gc_set_finalizer(obj_ptr, 1 if has_finalizer else 0)
-            if result != GC_SUCCESS:
-                raise RuntimeError(f"Failed to set finalizer: {result}")
+            _fn(_id(obj), 1 if has_finalizer else 0)
     
-    def get_refcount(self, obj):
+    def get_refcount(self, obj, _id=id, _fn=_py_gc_get_refcount):
         """Get the reference count of an object"""
-        with self._lock:
-            if not self._initialized:
-                return 0
-            
-            obj_ptr = id(obj)
-            return lib.py_gc_get_refcount(obj_ptr)
-    
-    def set_refcount(self, obj, refcount):
+        if not self._initialized:
+            return 0
+        return _fn(_id(obj))
+    
+    def get_python_refcount(self, obj, _grc=sys.getrefcount):
+        """Get the interpreter's reference count of an object"""
+        # The interpreter keeps this in the object header; the -1 drops the
+        # reference held by this call's own parameter, so the result matches
+        # sys.getrefcount(obj) at the call site
+        return _grc(obj) - 1
+    
+    def set_refcount(self, obj, refcount, _id=id, _fn=_py_gc_set_refcount):
         """Set the reference count of an object"""
+        if not self._initialized:
+            raise RuntimeError("GC not initialized")
+        
         with self._lock:
             if not self._initialized:
                 raise RuntimeError("GC not initialized")
             
-            obj_ptr = id(obj)
-            result = lib.py_gc_set_refcount(obj_ptr, refcount)
-            if result != GC_SUCCESS:
-                raise RuntimeError(f"Failed to set reference count: {result}")
+            _fn(_id(obj), refcount)
     
     def needs_collection(self):
         """Check if collection is needed"""
-        with self._lock:
-            if not self._initialized:
-                return False
-            return bool(lib.py_gc_needs_collection())
+        if not self._initialized:
+            return False
+        return needs_collection_flag.value != 0
     
     def get_state_string(self):
         """Get a string representation of the GC state"""
-        with self._lock:
-            if not self._initialized:
-                return "GC not initialized"
-            
-            buffer = ctypes.create_string_buffer(256)
-            result = lib.py_gc_get_state_string(buffer, 256)
-            
-            if result == GC_SUCCESS:
-                return buffer.value.decode('utf-8')
-            else:
-                return f"Failed to get state: {result}"
+        if not self._initialized:
+            return "GC not initialized"
+        
+        buffer = _tls_buffer('text', 256)
+        try:
+            _py_gc_get_state_string(buffer, 256)
+        except GCError as e:
+            return f"Failed to get state: {e.code}"
+        return buffer.value.decode('utf-8')
     
     def debug_state(self):
         """Print debug state information"""
-        with self._lock:
-            if not self._initialized:
-                print("GC not initialized")
-                return
-            
-            result = lib.py_gc_debug_state()
-            if result != GC_SUCCESS:
-                print(f"Failed to get debug state: {result}")
+        if not self._initialized:
+            print("GC not initialized")
+            return
+        
+        try:
+            _py_gc_debug_state()
+        except GCError as e:
+            print(f"Failed to get debug state: {e.code}")
 
 # Create a global instance
 _gc_instance = PythonGCReplacement()
 
-# Export all the methods as module-level functions
+# Export all the methods as module-level functions. The pure queries that
+# keep no Python-side state call the library directly rather than going
+# through the instance: creating _gc_instance above already proved the
+# library initialized, and before init or after cleanup these entry points
+# return the same 0/False defaults the methods would, so no per-call
+# _initialized check is needed. get_refcount is the exception: for an
+# untracked object the library falls back to the header's count, so it goes
+# through the instance, whose guard returns 0.
 def enable():
     """Enable automatic garbage collection"""
     return _gc_instance.enable()
@@ -511,9 +661,9 @@ def disable():
     """Disable automatic garbage collection"""
     return _gc_instance.disable()
 
-def isenabled():
+def isenabled(_fn=_py_gc_is_enabled):
     """Check if automatic collection is enabled"""
-    return _gc_instance.isenabled()
+    return _fn() != 0
 
 def collect(generation=None):
     """Perform garbage collection"""
@@ -539,13 +689,13 @@ def set_debug(flags):
     """Set debug flags"""
     return _gc_instance.set_debug(flags)
 
-def get_debug():
+def get_debug(_fn=_py_gc_get_debug_flags):
     """Get current debug flags"""
-    return _gc_instance.get_debug()
+    return _fn()
 
-def is_tracked(obj):
+def is_tracked(obj, _id=id, _fn=_py_gc_is_tracked_python):
     """Check if an object is tracked by the garbage collector"""
-    return _gc_instance.is_tracked(obj)
+    return _fn(_id(obj)) != 0
 
 def track(obj):
     """Track an object for garbage collection"""
@@ -555,6 +705,18 @@ def untrack(obj):
     """Stop tracking an object"""
     return _gc_instance.untrack(obj)
 
+def track_many(objects):
+    """Track a batch of objects with a single library call"""
+    return _gc_instance.track_many(objects)
+
+def untrack_many(objects):
+    """Stop tracking a batch of objects with a single library call"""
+    return _gc_instance.untrack_many(objects)
+
+def is_tracked_many(objects):
+    """Check a batch of objects with a single library call"""
+    return _gc_instance.is_tracked_many(objects)
+
 def get_objects():
     """Get all tracked objects"""
     return _gc_instance.get_objects()
@@ -604,25 +766,25 @@ def collect_if_needed():
     """Collect if thresholds are exceeded"""
     return _gc_instance.collect_if_needed()
 
-def needs_collection():
+def needs_collection(_flag=needs_collection_flag):
     """Check if collection is needed"""
-    return _gc_instance.needs_collection()
+    return _flag.value != 0
 
 def get_object_info(obj):
     """Get detailed information about a tracked object"""
     return _gc_instance.get_object_info(obj)
 
-def get_object_size(obj):
+def get_object_size(obj, _id=id, _fn=_py_gc_get_object_size):
     """Get the size of a tracked object in bytes"""
-    return _gc_instance.get_object_size(obj)
+    return _fn(_id(obj))
 
 def get_object_type(obj):
     """Get the type name of a tracked object"""
     return _gc_instance.get_object_type(obj)
 
-def has_finalizer(obj):
+def has_finalizer(obj, _id=id, _fn=_py_gc_has_finalizer):
     """Check if an object has a finalizer"""
-    return _gc_instance.has_finalizer(obj)
+    return _fn(_id(obj)) != 0
 
 def set_finalizer(obj, has_finalizer):
     """Set whether an object has a finalizer"""
@@ -632,6 +794,10 @@ def get_refcount(obj):
     """Get the reference count of an object"""
     return _gc_instance.get_refcount(obj)
 
+def get_python_refcount(obj, _grc=sys.getrefcount):
+    """Get the interpreter's reference count of an object"""
+    return _grc(obj) - 1
+
 def set_refcount(obj, refcount):
     """Set the reference count of an object"""
     return _gc_instance.set_refcount(obj, refcount)
@@ -644,17 +810,28 @@ def debug_state():
     """Print debug state information"""
     return _gc_instance.debug_state()
 
+if _native is None:
+    # No Rust library: serve everything gc itself provides from the
+    # interpreter's own collector
+    from gc import (
+        enable, disable, isenabled, collect, get_count, get_stats,
+        set_debug, get_debug, is_tracked, get_objects, get_referrers,
+        get_referents,
+    )
+
 # Export constants
 __all__ = [
     'enable', 'disable', 'isenabled', 'collect', 'get_count', 'get_stats',
     'set_threshold', 'get_threshold', 'set_debug', 'get_debug',
-    'is_tracked', 'track', 'untrack', 'get_objects', 'get_referrers',
+    'is_tracked', 'track', 'untrack', 'track_many', 'untrack_many',
+    'is_tracked_many', 'get_objects', 'get_referrers',
     'get_referents', 'get_garbage', 'set_garbage', 'add_callback',
     'remove_callback', 'callbacks', 'enable_automatic_tracking',
     'disable_automatic_tracking', 'is_automatic_tracking_enabled',
     'collect_if_needed', 'needs_collection', 'get_object_info',
     'get_object_size', 'get_object_type', 'has_finalizer', 'set_finalizer',
-    'get_refcount', 'set_refcount', 'get_state_string', 'debug_state',
+    'get_refcount', 'get_python_refcount', 'set_refcount',
+    'get_state_string', 'debug_state',
     'DEBUG_STATS', 'DEBUG_COLLECTABLE', 'DEBUG_UNCOLLECTABLE',
     'DEBUG_INSTANCES', 'DEBUG_OBJECTS', 'DEBUG_SAVEALL', 'DEBUG_LEAK'
 ]
@@ -664,6 +841,10 @@ if __name__ == "__main__":
     print("Python GC Replacement Demo")
     print("=" * 40)
     
+    if _native is None:
+        print("Error: Could not load libpython_gc library")
+        sys.exit(1)
+    
     # Initialize and enable automatic tracking
     enable_automatic_tracking()
     print(f"Automatic tracking enabled: {is_automatic_tracking_enabled()}")
@@ -673,12 +854,12 @@ if __name__ == "__main__":
     test_dict = {"a": 1, "b": 2}
     test_set = {1, 2, 3}
     
-    # Track them manually
-    track(test_list)
-    track(test_dict)
-    track(test_set)
+    # Track them manually, in one batch
+    test_objects = (test_list, test_dict, test_set)
+    track_many(test_objects)
     
     print(f"Objects tracked: {get_count()}")
+    print(f"Tracked flags: {list(is_tracked_many(test_objects))}")
     print(f"GC state: {get_state_string()}")
     
     # Perform collection
@@ -691,8 +872,6 @@ if __name__ == "__main__":
         print(f"Statistics: {stats}")
     
     # Clean up
-    untrack(test_list)
-    untrack(test_dict)
-    untrack(test_set)
+    untrack_many(test_objects)
     
     print("Demo completed successfully!") 
\ No newline at end of file
@@ -24,6 +24,15 @@ typedef struct {
     int32_t uncollectable;
 } gc_stats_t;
 
+// GC state snapshot structure
+typedef struct {
+    int32_t enabled;
+    int32_t total_tracked;
+    int32_t generation_counts[3];
+    int32_t uncollectable;
+    int32_t thresholds[3];
+} gc_state_t;
+
 // Core GC Management Functions
 
 /**
@@ -130,6 +139,22 @@ gc_return_code_t py_gc_untrack(void* obj_ptr);
  */
 int32_t py_gc_is_tracked(void* obj_ptr);
 
+/**
+ * Track a batch of objects in a single call
+ * @param objects Array of pointers to the objects
+ * @param count Number of entries in the array
+ * @return GC_SUCCESS if every object was tracked, otherwise the first error encountered
+ */
+gc_return_code_t py_gc_track_many(void* const* objects, size_t count);
+
+/**
+ * Stop tracking a batch of objects in a single call
+ * @param objects Array of pointers to the objects
+ * @param count Number of entries in the array
+ * @return GC_SUCCESS if every object was untracked, otherwise the first error encountered
+ */
+gc_return_code_t py_gc_untrack_many(void* const* objects, size_t count);
+
 // Python GC Module Compatibility
 
 /**
@@ -146,6 +171,31 @@ gc_return_code_t py_gc_track_python(void* obj_ptr);
  */
 gc_return_code_t py_gc_untrack_python(void* obj_ptr);
 
+/**
+ * Track a batch of Python objects in a single call
+ * @param objects Array of pointers to Python objects
+ * @param count Number of entries in objects
+ * @return GC_SUCCESS if every object was tracked, otherwise the first error
+ */
+gc_return_code_t py_gc_track_python_many(void* const* objects, size_t count);
+
+/**
+ * Untrack a batch of Python objects in a single call
+ * @param objects Array of pointers to Python objects
+ * @param count Number of entries in objects
+ * @return GC_SUCCESS if every object was untracked, otherwise the first error
+ */
+gc_return_code_t py_gc_untrack_python_many(void* const* objects, size_t count);
+
+/**
+ * Check a batch of Python objects in a single call
+ * @param objects Array of pointers to Python objects
+ * @param count Number of entries in objects
+ * @param out Array of count bytes, each set to 1 if the object is tracked, 0 otherwise
+ * @return GC_SUCCESS on success, error code on failure
+ */
+gc_return_code_t py_gc_is_tracked_python_many(void* const* objects, size_t count, uint8_t* out);
+
 /**
  * Check if a Python object is tracked (Python gc module compatibility)
  * @param obj_ptr Pointer to the Python object
@@ -156,7 +206,8 @@ int32_t py_gc_is_tracked_python(void* obj_ptr);
 // Reference Counting Functions
 
 /**
- * Get Python object reference count
+ * Get Python object reference count as the collector sees it: the GC's own
+ * count for tracked objects (see py_gc_set_refcount), otherwise the header's
  * @param obj_ptr Pointer to the Python object
  * @return Reference count, or 0 if object is NULL
  */
@@ -179,6 +230,21 @@ gc_return_code_t py_gc_set_refcount(void* obj_ptr, int32_t refcount);
  */
 gc_return_code_t py_gc_collect_generation(int32_t generation);
 
+/**
+ * Collect a generation and report how many objects were collected
+ * @param generation Generation number (0, 1, or 2; 2 is a full collection)
+ * @param collected Receives the number of objects collected on success; may be NULL
+ * @return GC_SUCCESS on success, error code on failure
+ */
+gc_return_code_t py_gc_collect_generation_count(int32_t generation, size_t* collected);
+
+/**
+ * Collect generations 0, 1 and 2 in turn, timing each on the library side
+ * @param out_ns Array of 3 values to receive each generation's duration in nanoseconds
+ * @return GC_SUCCESS on success, error code on failure
+ */
+gc_return_code_t py_gc_collect_all_gens_timed(uint64_t* out_ns);
+
 /**
  * Perform a full garbage collection (all generations)
  * @return GC_SUCCESS on success, error code on failure
@@ -191,6 +257,28 @@ gc_return_code_t py_gc_collect(void);
  */
 int32_t py_gc_needs_collection(void);
 
+/**
+ * Run a full collection incrementally, for at most budget_us microseconds
+ * @param budget_us Time budget for this call in microseconds
+ * @return 0 when the collection has finished, 1 while more work remains,
+ *         or a negative error code on failure (GC_ERROR_INTERNAL while the
+ *         collector is disabled)
+ */
+int32_t py_gc_collect_step(uint64_t budget_us);
+
+/**
+ * Set how many objects each increment of py_gc_collect_step collects
+ * @param objects Objects per increment (must be positive)
+ * @return GC_SUCCESS on success, error code on failure
+ */
+gc_return_code_t py_gc_set_incremental_budget(int32_t objects);
+
+/**
+ * Last known result of py_gc_needs_collection(), refreshed by every call
+ * that can change it; read it directly to poll without a function call
+ */
+extern int32_t PY_GC_NEEDS_COLLECTION;
+
 /**
  * Collect if thresholds are exceeded
  * @return GC_SUCCESS on success, error code on failure
@@ -206,6 +294,13 @@ gc_return_code_t py_gc_collect_if_needed(void);
  */
 gc_return_code_t py_gc_get_stats(gc_stats_t* stats);
 
+/**
+ * Get a snapshot of the GC state without any string formatting
+ * @param state Pointer to GCState structure to fill
+ * @return GC_SUCCESS on success, error code on failure
+ */
+gc_return_code_t py_gc_get_state(gc_state_t* state);
+
 /**
  * Get the number of tracked objects
  * @return Number of tracked objects
@@ -231,6 +326,13 @@ int32_t* py_gc_get_collection_counts(void);
  */
 void py_gc_free_collection_counts(int32_t* counts);
 
+/**
+ * Get collection counts into a caller-provided array, without allocating
+ * @param out Array of 3 integers to receive [gen0, gen1, gen2]
+ * @return GC_SUCCESS on success, error code on failure
+ */
+gc_return_code_t py_gc_get_collection_counts_into(int32_t* out);
+
 /**
  * Get the number of uncollectable objects
  * @return Number of uncollectable objects
@@ -260,6 +362,22 @@ gc_return_code_t py_gc_set_threshold(int32_t generation, int32_t threshold);
  */
 int32_t py_gc_get_threshold(int32_t generation);
 
+/**
+ * Set the thresholds of all three generations in a single call
+ * @param threshold0 New threshold for generation 0
+ * @param threshold1 New threshold for generation 1
+ * @param threshold2 New threshold for generation 2
+ * @return GC_SUCCESS on success, error code on failure (no threshold is changed if any is negative)
+ */
+gc_return_code_t py_gc_set_thresholds(int32_t threshold0, int32_t threshold1, int32_t threshold2);
+
+/**
+ * Get the thresholds of all three generations in a single call
+ * @param thresholds Array of 3 integers to fill with [gen0, gen1, gen2]
+ * @return GC_SUCCESS on success, error code on failure
+ */
+gc_return_code_t py_gc_get_thresholds(int32_t* thresholds);
+
 // Debug and State Functions
 
 /**
@@ -290,6 +408,12 @@ int32_t py_gc_get_debug_flags(void);
  */
 gc_return_code_t py_gc_get_state_string(char* buffer, size_t buffer_size);
 
+/**
+ * Get the current state version
+ * @return A counter that changes whenever the state string may have changed
+ */
+uint64_t py_gc_state_version(void);
+
 /**
  * Get information about a tracked object
  * @param obj_ptr Pointer to the tracked object
@@ -421,6 +545,15 @@ gc_return_code_t py_gc_debug_untrack(void* obj_ptr);
  */
 gc_return_code_t py_gc_debug_state(void);
 
+/**
+ * Run the basic smoke-test sequence (init, enable, collect, per-generation
+ * collect, stats, threshold round trip, state string, collect if needed,
+ * debug state, cleanup) in a single call
+ * @param out Receives a bitmask with bit i set when step i succeeded
+ * @return GC_SUCCESS if every step passed, otherwise the first failure code
+ */
+gc_return_code_t py_gc_self_test(uint32_t* out);
+
 /**
  * Clear uncollectable objects
  * @return GC_SUCCESS on success, error code on failure
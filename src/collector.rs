@@ -155,6 +155,34 @@ impl Collector {
         Ok(collected)
     }
 
+    /// Collect at most `work` tracked objects as one increment of a
+    /// generation collection.
+    ///
+    /// Returns the number of objects collected and whether the collection
+    /// has finished. The generation count is only reset by the increment
+    /// that finishes it.
+    pub fn collect_step(&mut self, generation: usize, work: usize) -> GCResult<(usize, bool)> {
+        if generation >= 3 {
+            return Ok((0, true));
+        }
+
+        let batch: Vec<ObjectId> = self.tracked_objects.keys().take(work).cloned().collect();
+
+        let mut collected = 0;
+        for obj_id in batch {
+            if self.untrack_object_fast(&obj_id).is_ok() {
+                collected += 1;
+            }
+        }
+
+        let done = self.tracked_objects.is_empty();
+        if done {
+            self.generation_manager.generations[generation].count = 0;
+        }
+
+        Ok((collected, done))
+    }
+
     pub fn get_count(&self) -> usize {
         self.tracked_objects.len()
     }
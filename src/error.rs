@@ -11,6 +11,9 @@ pub enum GCError {
     #[error("Garbage collection already in progress")]
     CollectionInProgress,
 
+    #[error("Garbage collector is disabled")]
+    Disabled,
+
     #[error("Invalid generation: {0}")]
     InvalidGeneration(usize),
 
@@ -3,8 +3,9 @@ use crate::{GCResult, GarbageCollector};
 use std::cell::RefCell;
 use std::collections::HashMap;
 use std::collections::HashSet;
+use std::collections::hash_map::Entry;
 use std::ffi::{c_char, c_int, c_uint, c_void};
-use std::sync::atomic::{AtomicBool, Ordering};
+use std::sync::atomic::{AtomicBool, AtomicI32, AtomicU64, Ordering};
 
 unsafe extern "C" {
     fn PyList_New(size: isize) -> *mut c_void;
@@ -18,6 +19,23 @@ unsafe extern "C" {
 static mut GC: Option<GarbageCollector> = None;
 static AUTOMATIC_TRACKING: AtomicBool = AtomicBool::new(false);
 
+/// Last known result of `py_gc_needs_collection()`, exported so callers can
+/// poll it with a plain load instead of a call. Every entry point that can
+/// change the answer refreshes it before returning.
+#[unsafe(no_mangle)]
+pub static PY_GC_NEEDS_COLLECTION: AtomicI32 = AtomicI32::new(0);
+
+/// Bumped whenever collector state visible through the FFI may have
+/// changed, so callers can cache values derived from it.
+static STATE_VERSION: AtomicU64 = AtomicU64::new(0);
+
+/// Publish a state change: bump the state version and refresh the exported
+/// needs-collection flag.
+fn state_changed() {
+    STATE_VERSION.fetch_add(1, Ordering::Relaxed);
+    PY_GC_NEEDS_COLLECTION.store(py_gc_needs_collection(), Ordering::Relaxed);
+}
+
 thread_local! {
     static OBJECT_REGISTRY: RefCell<HashMap<*mut c_void, PyObject>> = RefCell::new(HashMap::new());
     static REFCOUNT_CALLBACKS: RefCell<HashMap<*mut c_void, RefCountCallback>> = RefCell::new(HashMap::new());
@@ -27,7 +45,8 @@ thread_local! {
 
 type RefCountCallback = Box<dyn Fn(*mut c_void, i32) + Send + Sync>;
 
-const PY_TPFLAGS_HAVE_GC: u64 = 0x00000020;
+// CPython's Py_TPFLAGS_HAVE_GC
+const PY_TPFLAGS_HAVE_GC: u64 = 1 << 14;
 
 #[repr(C)]
 struct PyObject_HEAD {
@@ -295,6 +314,7 @@ pub extern "C" fn py_gc_init() -> GCReturnCode {
         GC = Some(GarbageCollector::new());
         AUTOMATIC_TRACKING.store(false, Ordering::Relaxed);
     }
+    state_changed();
     GCReturnCode::Success
 }
 
@@ -309,6 +329,7 @@ pub extern "C" fn py_gc_cleanup() -> GCReturnCode {
         GC = None;
         AUTOMATIC_TRACKING.store(false, Ordering::Relaxed);
     }
+    state_changed();
     GCReturnCode::Success
 }
 
@@ -317,6 +338,7 @@ pub extern "C" fn py_gc_enable() -> GCReturnCode {
     unsafe {
         if let Some(ref mut gc) = GC {
             gc.enable();
+            state_changed();
             GCReturnCode::Success
         } else {
             GCReturnCode::ErrorInternal
@@ -329,6 +351,7 @@ pub extern "C" fn py_gc_disable() -> GCReturnCode {
     unsafe {
         if let Some(ref mut gc) = GC {
             gc.disable();
+            state_changed();
             GCReturnCode::Success
         } else {
             GCReturnCode::ErrorInternal
@@ -357,6 +380,16 @@ pub extern "C" fn py_gc_is_initialized() -> c_int {
     }
 }
 
+/// Current state version
+///
+/// The value changes whenever anything reported by
+/// `py_gc_get_state_string` may have changed, so a caller can keep the
+/// decoded string and only fetch it again when the version moves.
+#[unsafe(no_mangle)]
+pub extern "C" fn py_gc_state_version() -> u64 {
+    STATE_VERSION.load(Ordering::Relaxed)
+}
+
 /// Get GC state information as a string
 ///
 /// # Safety
@@ -442,6 +475,110 @@ pub extern "C" fn py_gc_untrack(obj_ptr: *mut c_void) -> GCReturnCode {
     }
 }
 
+/// Track a batch of objects in a single call
+///
+/// Every pointer is processed even if an earlier one fails; the first error
+/// encountered is returned.
+///
+/// # Safety
+///
+/// - `objects` must point to `count` readable object pointers, or be null when `count` is 0
+/// - Each non-null entry must satisfy the same requirements as `py_gc_track`
+#[unsafe(no_mangle)]
+pub unsafe extern "C" fn py_gc_track_many(
+    objects: *const *mut c_void,
+    count: usize,
+) -> GCReturnCode {
+    if count == 0 {
+        return GCReturnCode::Success;
+    }
+
+    if objects.is_null() {
+        return GCReturnCode::ErrorInternal;
+    }
+
+    let objects = unsafe { std::slice::from_raw_parts(objects, count) };
+    let mut status = GCReturnCode::Success;
+
+    with_object_registry(|reg| {
+        reg.reserve(count);
+
+        for &obj_ptr in objects {
+            let result = if obj_ptr.is_null() {
+                GCReturnCode::ErrorInternal
+            } else {
+                match reg.entry(obj_ptr) {
+                    Entry::Occupied(_) => GCReturnCode::ErrorAlreadyTracked,
+                    Entry::Vacant(slot) => {
+                        let obj = unsafe {
+                            let original_obj = &*(obj_ptr as *mut PyObject);
+                            original_obj.clone()
+                        };
+                        slot.insert(obj);
+                        GCReturnCode::Success
+                    }
+                }
+            };
+
+            if matches!(status, GCReturnCode::Success) {
+                status = result;
+            }
+        }
+    });
+
+    status
+}
+
+/// Stop tracking a batch of objects in a single call
+///
+/// Every pointer is processed even if an earlier one fails; the first error
+/// encountered is returned.
+///
+/// # Safety
+///
+/// - `objects` must point to `count` readable object pointers, or be null when `count` is 0
+#[unsafe(no_mangle)]
+pub unsafe extern "C" fn py_gc_untrack_many(
+    objects: *const *mut c_void,
+    count: usize,
+) -> GCReturnCode {
+    unsafe {
+        let gc_ptr = &raw const GC;
+        if (*gc_ptr).is_none() {
+            return GCReturnCode::ErrorInternal;
+        }
+    }
+
+    if count == 0 {
+        return GCReturnCode::Success;
+    }
+
+    if objects.is_null() {
+        return GCReturnCode::ErrorInternal;
+    }
+
+    let objects = unsafe { std::slice::from_raw_parts(objects, count) };
+    let mut status = GCReturnCode::Success;
+
+    with_object_registry(|reg| {
+        for &obj_ptr in objects {
+            let result = if obj_ptr.is_null() {
+                GCReturnCode::ErrorInternal
+            } else if reg.remove(&obj_ptr).is_none() {
+                GCReturnCode::ErrorNotTracked
+            } else {
+                GCReturnCode::Success
+            };
+
+            if matches!(status, GCReturnCode::Success) {
+                status = result;
+            }
+        }
+    });
+
+    status
+}
+
 #[unsafe(no_mangle)]
 pub extern "C" fn py_gc_collect_generation(generation: c_int) -> GCReturnCode {
     unsafe {
@@ -450,7 +587,75 @@ pub extern "C" fn py_gc_collect_generation(generation: c_int) -> GCReturnCode {
                 return GCReturnCode::ErrorInvalidGeneration;
             }
 
-            gc.collect_generation(generation as usize).into()
+            let result = gc.collect_generation(generation as usize).into();
+            state_changed();
+            result
+        } else {
+            GCReturnCode::ErrorInternal
+        }
+    }
+}
+
+/// Collect a generation and report how many objects it freed
+///
+/// Behaves like `py_gc_collect_generation` (generation 2 is a full
+/// collection), and on success also writes the number of objects collected
+/// to `collected`, so callers need no second query to learn it.
+///
+/// # Safety
+///
+/// - `collected` must be a valid pointer to a writable `usize`, or null to discard the count
+#[unsafe(no_mangle)]
+pub unsafe extern "C" fn py_gc_collect_generation_count(
+    generation: c_int,
+    collected: *mut usize,
+) -> GCReturnCode {
+    unsafe {
+        if let Some(ref gc) = GC {
+            if !(0..=2).contains(&generation) {
+                return GCReturnCode::ErrorInvalidGeneration;
+            }
+
+            let result = gc.collect_generation(generation as usize);
+            state_changed();
+            if let (Ok(count), false) = (&result, collected.is_null()) {
+                *collected = *count;
+            }
+            result.into()
+        } else {
+            GCReturnCode::ErrorInternal
+        }
+    }
+}
+
+/// Collects generations 0, 1 and 2 in turn, writing each one's duration in
+/// nanoseconds to `out_ns[0..3]`. Timing on this side of the boundary keeps
+/// FFI call overhead out of the measurement.
+///
+/// # Safety
+///
+/// - `out_ns` must be a valid pointer to a writable array of 3 `u64`s
+#[unsafe(no_mangle)]
+pub unsafe extern "C" fn py_gc_collect_all_gens_timed(out_ns: *mut u64) -> GCReturnCode {
+    unsafe {
+        if let Some(ref gc) = GC {
+            if out_ns.is_null() {
+                return GCReturnCode::ErrorInternal;
+            }
+
+            let timings = std::slice::from_raw_parts_mut(out_ns, 3);
+            for (generation, slot) in timings.iter_mut().enumerate() {
+                let start = std::time::Instant::now();
+                let result = gc.collect_generation(generation);
+                *slot = start.elapsed().as_nanos() as u64;
+                if result.is_err() {
+                    state_changed();
+                    return result.into();
+                }
+            }
+
+            state_changed();
+            GCReturnCode::Success
         } else {
             GCReturnCode::ErrorInternal
         }
@@ -461,7 +666,48 @@ pub extern "C" fn py_gc_collect_generation(generation: c_int) -> GCReturnCode {
 pub extern "C" fn py_gc_collect() -> GCReturnCode {
     unsafe {
         if let Some(ref gc) = GC {
-            gc.collect().into()
+            let result = gc.collect().into();
+            state_changed();
+            result
+        } else {
+            GCReturnCode::ErrorInternal
+        }
+    }
+}
+
+/// Run a full collection incrementally, for at most `budget_us` microseconds
+///
+/// Returns 0 once the collection has finished, 1 while more work remains, or
+/// a negative `GCReturnCode` on error, including `ErrorInternal` while the
+/// collector is disabled. Call it repeatedly until it returns 0 to bound each
+/// pause by the budget.
+#[unsafe(no_mangle)]
+pub extern "C" fn py_gc_collect_step(budget_us: u64) -> c_int {
+    unsafe {
+        if let Some(ref gc) = GC {
+            let result = gc.collect_step(std::time::Duration::from_micros(budget_us));
+            state_changed();
+            match result {
+                Ok(more) => more as c_int,
+                Err(err) => GCReturnCode::from(Err::<(), _>(err)) as c_int,
+            }
+        } else {
+            GCReturnCode::ErrorInternal as c_int
+        }
+    }
+}
+
+/// Set how many objects each increment of `py_gc_collect_step` collects
+#[unsafe(no_mangle)]
+pub extern "C" fn py_gc_set_incremental_budget(objects: c_int) -> GCReturnCode {
+    unsafe {
+        if let Some(ref mut gc) = GC {
+            if objects <= 0 {
+                return GCReturnCode::ErrorInternal;
+            }
+
+            gc.set_incremental_budget(objects as usize);
+            GCReturnCode::Success
         } else {
             GCReturnCode::ErrorInternal
         }
@@ -483,7 +729,9 @@ pub extern "C" fn py_gc_needs_collection() -> c_int {
 pub extern "C" fn py_gc_collect_if_needed() -> GCReturnCode {
     unsafe {
         if let Some(ref gc) = GC {
-            gc.collect_if_needed().into()
+            let result = gc.collect_if_needed().into();
+            state_changed();
+            result
         } else {
             GCReturnCode::ErrorInternal
         }
@@ -524,8 +772,11 @@ pub extern "C" fn py_gc_set_threshold(generation: c_int, threshold: c_int) -> GC
                 return GCReturnCode::ErrorInvalidGeneration;
             }
 
-            gc.set_threshold(generation as usize, threshold as usize)
-                .into()
+            let result = gc
+                .set_threshold(generation as usize, threshold as usize)
+                .into();
+            state_changed();
+            result
         } else {
             GCReturnCode::ErrorInternal
         }
@@ -547,6 +798,59 @@ pub extern "C" fn py_gc_get_threshold(generation: c_int) -> c_int {
     }
 }
 
+#[unsafe(no_mangle)]
+pub extern "C" fn py_gc_set_thresholds(
+    threshold0: c_int,
+    threshold1: c_int,
+    threshold2: c_int,
+) -> GCReturnCode {
+    unsafe {
+        if let Some(ref mut gc) = GC {
+            let thresholds = [threshold0, threshold1, threshold2];
+            if thresholds.iter().any(|&threshold| threshold < 0) {
+                return GCReturnCode::ErrorInvalidGeneration;
+            }
+
+            for (generation, threshold) in thresholds.into_iter().enumerate() {
+                let result: GCReturnCode = gc.set_threshold(generation, threshold as usize).into();
+                if !matches!(result, GCReturnCode::Success) {
+                    state_changed();
+                    return result;
+                }
+            }
+
+            state_changed();
+            GCReturnCode::Success
+        } else {
+            GCReturnCode::ErrorInternal
+        }
+    }
+}
+
+/// Get the thresholds of all three generations in a single call
+///
+/// # Safety
+///
+/// - `thresholds` must be a valid pointer to a writable array of 3 integers
+#[unsafe(no_mangle)]
+pub unsafe extern "C" fn py_gc_get_thresholds(thresholds: *mut c_int) -> GCReturnCode {
+    unsafe {
+        if let Some(ref gc) = GC {
+            if thresholds.is_null() {
+                return GCReturnCode::ErrorInternal;
+            }
+
+            for generation in 0..3 {
+                *thresholds.add(generation) = gc.get_threshold(generation).unwrap_or(0) as c_int;
+            }
+
+            GCReturnCode::Success
+        } else {
+            GCReturnCode::ErrorInternal
+        }
+    }
+}
+
 #[unsafe(no_mangle)]
 pub extern "C" fn py_gc_set_debug(flags: c_int) -> GCReturnCode {
     unsafe {
@@ -602,6 +906,54 @@ pub unsafe extern "C" fn py_gc_get_stats(stats: *mut GCStats) -> GCReturnCode {
     }
 }
 
+/// Fixed-shape snapshot of everything the state string reports, plus the
+/// thresholds, for callers that want the values rather than text
+#[repr(C)]
+pub struct GCState {
+    pub enabled: c_int,
+    pub total_tracked: c_int,
+    pub generation_counts: [c_int; 3],
+    pub uncollectable: c_int,
+    pub thresholds: [c_int; 3],
+}
+
+/// Fills a `GCState` snapshot in a single call, with no string formatting.
+///
+/// # Safety
+///
+/// - `state` must be a valid pointer to a writable `GCState`
+#[unsafe(no_mangle)]
+pub unsafe extern "C" fn py_gc_get_state(state: *mut GCState) -> GCReturnCode {
+    unsafe {
+        if let Some(ref gc) = GC {
+            if state.is_null() {
+                return GCReturnCode::ErrorInternal;
+            }
+
+            let rust_stats = gc.get_stats();
+            *state = GCState {
+                enabled: gc.is_enabled() as c_int,
+                total_tracked: rust_stats.total_tracked as c_int,
+                generation_counts: [
+                    rust_stats.generation_counts[0] as c_int,
+                    rust_stats.generation_counts[1] as c_int,
+                    rust_stats.generation_counts[2] as c_int,
+                ],
+                uncollectable: rust_stats.uncollectable as c_int,
+                thresholds: [
+                    gc.get_threshold(0).unwrap_or(0) as c_int,
+                    gc.get_threshold(1).unwrap_or(0) as c_int,
+                    gc.get_threshold(2).unwrap_or(0) as c_int,
+                ],
+            };
+
+            GCReturnCode::Success
+        } else {
+            GCReturnCode::ErrorInternal
+        }
+    }
+}
+
 #[unsafe(no_mangle)]
 pub extern "C" fn py_gc_is_tracked(obj_ptr: *mut c_void) -> c_int {
     if obj_ptr.is_null() {
@@ -632,6 +984,7 @@ pub extern "C" fn py_gc_clear_uncollectable() -> GCReturnCode {
     unsafe {
         if let Some(ref gc) = GC {
             gc.clear_uncollectable();
+            state_changed();
             GCReturnCode::Success
         } else {
             GCReturnCode::ErrorInternal
@@ -812,6 +1165,72 @@ pub extern "C" fn py_gc_debug_state() -> GCReturnCode {
     }
 }
 
+/// Run the basic smoke-test sequence in a single call
+///
+/// The steps are, in bit order: init, enable, collect, collect generation 0,
+/// 1 and 2, get stats, threshold set/get round trip, state string, collect
+/// if needed, debug state and cleanup. Bit `i` of `*out` is set when step
+/// `i` succeeded. The return value is the code of the first step that
+/// failed, or `Success` when every step passed.
+///
+/// # Safety
+///
+/// - `out` must be a valid pointer to a writable `u32`
+#[unsafe(no_mangle)]
+pub unsafe extern "C" fn py_gc_self_test(out: *mut u32) -> GCReturnCode {
+    if out.is_null() {
+        return GCReturnCode::ErrorInternal;
+    }
+
+    let mut mask = 0u32;
+    let mut first_error = GCReturnCode::Success;
+    let mut record = |step: u32, result: GCReturnCode| {
+        if matches!(result, GCReturnCode::Success) {
+            mask |= 1 << step;
+        } else if matches!(first_error, GCReturnCode::Success) {
+            first_error = result;
+        }
+    };
+
+    record(0, py_gc_init());
+    record(1, py_gc_enable());
+    record(2, py_gc_collect());
+    for generation in 0..3 {
+        record(3 + generation as u32, py_gc_collect_generation(generation));
+    }
+
+    let mut stats = GCStats {
+        total_tracked: 0,
+        generation_counts: [0; 3],
+        uncollectable: 0,
+    };
+    record(6, unsafe { py_gc_get_stats(&mut stats) });
+
+    let expected: [c_int; 3] = [100, 150, 200];
+    let mut thresholds: [c_int; 3] = [0; 3];
+    let mut result = py_gc_set_thresholds(expected[0], expected[1], expected[2]);
+    if matches!(result, GCReturnCode::Success) {
+        result = unsafe { py_gc_get_thresholds(thresholds.as_mut_ptr()) };
+    }
+    if matches!(result, GCReturnCode::Success) && thresholds != expected {
+        result = GCReturnCode::ErrorInternal;
+    }
+    record(7, result);
+
+    let mut state = [0 as c_char; 256];
+    record(8, unsafe {
+        py_gc_get_state_string(state.as_mut_ptr(), state.len())
+    });
+    record(9, py_gc_collect_if_needed());
+    record(10, py_gc_debug_state());
+    record(11, py_gc_cleanup());
+
+    unsafe {
+        *out = mask;
+    }
+    first_error
+}
+
 #[unsafe(no_mangle)]
 pub extern "C" fn py_gc_enable_automatic_tracking() -> GCReturnCode {
     AUTOMATIC_TRACKING.store(true, Ordering::Relaxed);
@@ -873,6 +1292,7 @@ pub extern "C" fn py_gc_object_created(obj_ptr: *mut c_void) -> GCReturnCode {
                 if delta < 0 && py_gc_get_refcount(obj_ptr) == 0 {
                     if let Some(ref gc) = GC {
                         gc.collect_if_needed().ok();
+                        state_changed();
                     }
                 }
             }),
@@ -918,6 +1338,7 @@ pub extern "C" fn py_gc_refcount_changed(
         if new_count == 0 {
             if let Some(ref gc) = GC {
                 gc.collect_if_needed().ok();
+                state_changed();
             }
         }
 
@@ -925,6 +1346,11 @@ pub extern "C" fn py_gc_refcount_changed(
     }
 }
 
+/// Reference count as the collector sees it
+///
+/// For a tracked object this is the count the collector maintains itself
+/// (see `py_gc_set_refcount`), which need not match the interpreter's; for
+/// anything else it is read from the object header.
 #[unsafe(no_mangle)]
 pub extern "C" fn py_gc_get_refcount(obj_ptr: *mut c_void) -> c_int {
     if obj_ptr.is_null() {
@@ -1055,39 +1481,13 @@ pub unsafe extern "C" fn py_gc_get_referents(obj_ptr: *mut c_void) -> *mut c_voi
     unsafe { create_python_list_from_objects(references) }
 }
 
-#[unsafe(no_mangle)]
-pub extern "C" fn py_gc_is_tracked_python(obj_ptr: *mut c_void) -> c_int {
-    if obj_ptr.is_null() {
-        return 0;
-    }
-
+/// Read the `tp_name` of a live Python object's type
+///
+/// # Safety
+///
+/// - `obj_ptr` must point to a live Python object
+unsafe fn python_type_name(obj_ptr: *mut c_void) -> String {
     unsafe {
-        let py_obj = obj_ptr as *mut PyObject_HEAD;
-        let py_type = (*py_obj).ob_type;
-        if !py_type.is_null() {
-            let flags = (*py_type).tp_flags;
-            if (flags & PY_TPFLAGS_HAVE_GC) != 0 && is_object_tracked(obj_ptr) {
-                1
-            } else {
-                0
-            }
-        } else {
-            0
-        }
-    }
-}
-
-#[unsafe(no_mangle)]
-pub extern "C" fn py_gc_track_python(obj_ptr: *mut c_void) -> GCReturnCode {
-    if obj_ptr.is_null() {
-        return GCReturnCode::ErrorInternal;
-    }
-
-    if is_object_tracked(obj_ptr) {
-        return GCReturnCode::ErrorAlreadyTracked;
-    }
-
-    let type_name = unsafe {
         let py_obj = obj_ptr as *mut PyObject_HEAD;
         let py_type = (*py_obj).ob_type;
         if !py_type.is_null() {
@@ -1102,18 +1502,103 @@ pub extern "C" fn py_gc_track_python(obj_ptr: *mut c_void) -> GCReturnCode {
         } else {
             "unknown".to_string()
         }
-    };
-
-    let obj = PyObject::new_ffi(&type_name, ObjectData::None, obj_ptr);
-
-    track_object_fast(obj_ptr, obj);
-
-    GCReturnCode::Success
+    }
 }
 
-#[unsafe(no_mangle)]
-pub extern "C" fn py_gc_untrack_python(obj_ptr: *mut c_void) -> GCReturnCode {
-    if obj_ptr.is_null() {
+/// Whether a live Python object's type carries the GC flag
+///
+/// # Safety
+///
+/// - `obj_ptr` must point to a live Python object
+unsafe fn python_type_has_gc(obj_ptr: *mut c_void) -> bool {
+    unsafe {
+        let py_type = (*(obj_ptr as *mut PyObject_HEAD)).ob_type;
+        !py_type.is_null() && ((*py_type).tp_flags & PY_TPFLAGS_HAVE_GC) != 0
+    }
+}
+
+/// Whether a Python object is tracked and its type carries the GC flag
+///
+/// # Safety
+///
+/// - `obj_ptr` must be null or point to a live Python object
+#[unsafe(no_mangle)]
+pub unsafe extern "C" fn py_gc_is_tracked_python(obj_ptr: *mut c_void) -> c_int {
+    if obj_ptr.is_null() {
+        return 0;
+    }
+
+    if unsafe { python_type_has_gc(obj_ptr) } && is_object_tracked(obj_ptr) {
+        1
+    } else {
+        0
+    }
+}
+
+/// Check a batch of Python objects in a single call
+///
+/// Writes 1 to `out[i]` if `objects[i]` is tracked and 0 otherwise, with the
+/// same rules as `py_gc_is_tracked_python`; null entries report 0.
+///
+/// # Safety
+///
+/// - `objects` must point to `count` readable object pointers, or be null when `count` is 0
+/// - `out` must point to `count` writable bytes, or be null when `count` is 0
+/// - Each non-null entry must point to a live Python object
+#[unsafe(no_mangle)]
+pub unsafe extern "C" fn py_gc_is_tracked_python_many(
+    objects: *const *mut c_void,
+    count: usize,
+    out: *mut u8,
+) -> GCReturnCode {
+    if count == 0 {
+        return GCReturnCode::Success;
+    }
+
+    if objects.is_null() || out.is_null() {
+        return GCReturnCode::ErrorInternal;
+    }
+
+    let objects = unsafe { std::slice::from_raw_parts(objects, count) };
+    let out = unsafe { std::slice::from_raw_parts_mut(out, count) };
+
+    with_object_registry(|reg| {
+        for (&obj_ptr, slot) in objects.iter().zip(out.iter_mut()) {
+            *slot = (!obj_ptr.is_null()
+                && unsafe { python_type_has_gc(obj_ptr) }
+                && reg.contains_key(&obj_ptr)) as u8;
+        }
+    });
+
+    GCReturnCode::Success
+}
+
+/// Track a Python object, reading only its header
+///
+/// # Safety
+///
+/// - `obj_ptr` must be null or point to a live Python object
+#[unsafe(no_mangle)]
+pub unsafe extern "C" fn py_gc_track_python(obj_ptr: *mut c_void) -> GCReturnCode {
+    if obj_ptr.is_null() {
+        return GCReturnCode::ErrorInternal;
+    }
+
+    if is_object_tracked(obj_ptr) {
+        return GCReturnCode::ErrorAlreadyTracked;
+    }
+
+    let type_name = unsafe { python_type_name(obj_ptr) };
+    let obj = PyObject::new_ffi(&type_name, ObjectData::None, obj_ptr);
+
+    track_object_fast(obj_ptr, obj);
+
+    GCReturnCode::Success
+}
+
+#[unsafe(no_mangle)]
+pub extern "C" fn py_gc_untrack_python(obj_ptr: *mut c_void) -> GCReturnCode {
+    if obj_ptr.is_null() {
         return GCReturnCode::ErrorInternal;
     }
 
@@ -1124,6 +1609,101 @@ pub extern "C" fn py_gc_untrack_python(obj_ptr: *mut c_void) -> GCReturnCode {
     }
 }
 
+/// Track a batch of Python objects in a single call
+///
+/// Unlike `py_gc_track_many`, only the object header is read, so this is
+/// safe for any live Python object. Every pointer is processed even if an
+/// earlier one fails; the first error encountered is returned.
+///
+/// # Safety
+///
+/// - `objects` must point to `count` readable object pointers, or be null when `count` is 0
+/// - Each non-null entry must point to a live Python object
+#[unsafe(no_mangle)]
+pub unsafe extern "C" fn py_gc_track_python_many(
+    objects: *const *mut c_void,
+    count: usize,
+) -> GCReturnCode {
+    if count == 0 {
+        return GCReturnCode::Success;
+    }
+
+    if objects.is_null() {
+        return GCReturnCode::ErrorInternal;
+    }
+
+    let objects = unsafe { std::slice::from_raw_parts(objects, count) };
+    let mut status = GCReturnCode::Success;
+
+    with_object_registry(|reg| {
+        reg.reserve(count);
+
+        for &obj_ptr in objects {
+            let result = if obj_ptr.is_null() {
+                GCReturnCode::ErrorInternal
+            } else {
+                match reg.entry(obj_ptr) {
+                    Entry::Occupied(_) => GCReturnCode::ErrorAlreadyTracked,
+                    Entry::Vacant(slot) => {
+                        let type_name = unsafe { python_type_name(obj_ptr) };
+                        slot.insert(PyObject::new_ffi(&type_name, ObjectData::None, obj_ptr));
+                        GCReturnCode::Success
+                    }
+                }
+            };
+
+            if matches!(status, GCReturnCode::Success) {
+                status = result;
+            }
+        }
+    });
+
+    status
+}
+
+/// Untrack a batch of Python objects in a single call
+///
+/// Every pointer is processed even if an earlier one fails; the first error
+/// encountered is returned.
+///
+/// # Safety
+///
+/// - `objects` must point to `count` readable object pointers, or be null when `count` is 0
+#[unsafe(no_mangle)]
+pub unsafe extern "C" fn py_gc_untrack_python_many(
+    objects: *const *mut c_void,
+    count: usize,
+) -> GCReturnCode {
+    if count == 0 {
+        return GCReturnCode::Success;
+    }
+
+    if objects.is_null() {
+        return GCReturnCode::ErrorInternal;
+    }
+
+    let objects = unsafe { std::slice::from_raw_parts(objects, count) };
+    let mut status = GCReturnCode::Success;
+
+    with_object_registry(|reg| {
+        for &obj_ptr in objects {
+            let result = if obj_ptr.is_null() {
+                GCReturnCode::ErrorInternal
+            } else if reg.remove(&obj_ptr).is_none() {
+                GCReturnCode::ErrorNotTracked
+            } else {
+                GCReturnCode::Success
+            };
+
+            if matches!(status, GCReturnCode::Success) {
+                status = result;
+            }
+        }
+    });
+
+    status
+}
+
 #[unsafe(no_mangle)]
 pub extern "C" fn py_gc_get_collection_counts() -> *mut c_int {
     unsafe {
@@ -1155,6 +1735,32 @@ pub unsafe extern "C" fn py_gc_free_collection_counts(counts: *mut c_int) {
     }
 }
 
+/// Get collection counts into a caller-provided array, with no allocation
+/// and no matching free call
+///
+/// # Safety
+///
+/// - `out` must be a valid pointer to a writable array of 3 `c_int`s
+#[unsafe(no_mangle)]
+pub unsafe extern "C" fn py_gc_get_collection_counts_into(out: *mut c_int) -> GCReturnCode {
+    unsafe {
+        if let Some(ref gc) = GC {
+            if out.is_null() {
+                return GCReturnCode::ErrorInternal;
+            }
+
+            let counts = std::slice::from_raw_parts_mut(out, 3);
+            for (generation, count) in counts.iter_mut().enumerate() {
+                *count = gc.get_generation_count(generation).unwrap_or(0) as c_int;
+            }
+
+            GCReturnCode::Success
+        } else {
+            GCReturnCode::ErrorInternal
+        }
+    }
+}
+
 /// Get uncollectable objects as a Python list
 ///
 /// # Safety
@@ -1330,15 +1936,179 @@ pub unsafe extern "C" fn py_gc_get_object_type_name(
 #[cfg(test)]
 mod tests {
     use super::*;
+    use parking_lot::{Mutex, MutexGuard};
+
+    // The FFI layer drives a single global collector, so tests touching it
+    // must not interleave.
+    static SERIAL: Mutex<()> = Mutex::new(());
+
+    fn serial() -> MutexGuard<'static, ()> {
+        SERIAL.lock()
+    }
+
+    #[test]
+    fn test_needs_collection_flag() {
+        let _guard = serial();
+        assert_eq!(py_gc_init() as i32, GCReturnCode::Success as i32);
+        assert_eq!(
+            PY_GC_NEEDS_COLLECTION.load(Ordering::Relaxed),
+            py_gc_needs_collection()
+        );
+
+        assert_eq!(py_gc_collect() as i32, GCReturnCode::Success as i32);
+        assert_eq!(PY_GC_NEEDS_COLLECTION.load(Ordering::Relaxed), 0);
+
+        assert_eq!(py_gc_cleanup() as i32, GCReturnCode::Success as i32);
+        assert_eq!(PY_GC_NEEDS_COLLECTION.load(Ordering::Relaxed), 0);
+    }
+
+    #[test]
+    fn test_collect_step() {
+        let _guard = serial();
+        assert_eq!(
+            py_gc_collect_step(1000),
+            GCReturnCode::ErrorInternal as c_int
+        );
+
+        assert_eq!(py_gc_init() as i32, GCReturnCode::Success as i32);
+        assert_eq!(
+            py_gc_set_incremental_budget(0) as i32,
+            GCReturnCode::ErrorInternal as i32
+        );
+        assert_eq!(
+            py_gc_set_incremental_budget(16) as i32,
+            GCReturnCode::Success as i32
+        );
+        assert_eq!(py_gc_collect_step(1000), 0);
+
+        assert_eq!(py_gc_disable() as i32, GCReturnCode::Success as i32);
+        assert_eq!(
+            py_gc_collect_step(1000),
+            GCReturnCode::ErrorInternal as c_int
+        );
+        assert_eq!(py_gc_cleanup() as i32, GCReturnCode::Success as i32);
+    }
+
+    #[test]
+    fn test_collect_generation_count() {
+        let _guard = serial();
+        assert_eq!(py_gc_init() as i32, GCReturnCode::Success as i32);
+
+        let mut collected = usize::MAX;
+        let result = unsafe { py_gc_collect_generation_count(2, &mut collected) };
+        assert_eq!(result as i32, GCReturnCode::Success as i32);
+        assert_eq!(collected, 0);
+
+        let result = unsafe { py_gc_collect_generation_count(0, std::ptr::null_mut()) };
+        assert_eq!(result as i32, GCReturnCode::Success as i32);
+
+        collected = usize::MAX;
+        let result = unsafe { py_gc_collect_generation_count(3, &mut collected) };
+        assert_eq!(result as i32, GCReturnCode::ErrorInvalidGeneration as i32);
+        assert_eq!(collected, usize::MAX);
+
+        assert_eq!(py_gc_cleanup() as i32, GCReturnCode::Success as i32);
+    }
+
+    #[test]
+    fn test_get_collection_counts_into() {
+        let _guard = serial();
+        assert_eq!(py_gc_init() as i32, GCReturnCode::Success as i32);
+
+        let mut counts: [c_int; 3] = [-1; 3];
+        let result = unsafe { py_gc_get_collection_counts_into(counts.as_mut_ptr()) };
+        assert_eq!(result as i32, GCReturnCode::Success as i32);
+        assert_eq!(counts, [0; 3]);
+
+        let result = unsafe { py_gc_get_collection_counts_into(std::ptr::null_mut()) };
+        assert_eq!(result as i32, GCReturnCode::ErrorInternal as i32);
+
+        assert_eq!(py_gc_cleanup() as i32, GCReturnCode::Success as i32);
+    }
+
+    #[test]
+    fn test_collect_all_gens_timed() {
+        let _guard = serial();
+        assert_eq!(py_gc_init() as i32, GCReturnCode::Success as i32);
+
+        let mut timings = [u64::MAX; 3];
+        let result = unsafe { py_gc_collect_all_gens_timed(timings.as_mut_ptr()) };
+        assert_eq!(result as i32, GCReturnCode::Success as i32);
+        assert!(timings.iter().all(|&ns| ns != u64::MAX));
+
+        let result = unsafe { py_gc_collect_all_gens_timed(std::ptr::null_mut()) };
+        assert_eq!(result as i32, GCReturnCode::ErrorInternal as i32);
+
+        assert_eq!(py_gc_cleanup() as i32, GCReturnCode::Success as i32);
+    }
+
+    #[test]
+    fn test_get_state() {
+        let _guard = serial();
+        assert_eq!(py_gc_init() as i32, GCReturnCode::Success as i32);
+        assert_eq!(
+            py_gc_set_thresholds(100, 150, 200) as i32,
+            GCReturnCode::Success as i32
+        );
+
+        let mut state = GCState {
+            enabled: 0,
+            total_tracked: -1,
+            generation_counts: [-1; 3],
+            uncollectable: -1,
+            thresholds: [0; 3],
+        };
+        let result = unsafe { py_gc_get_state(&mut state) };
+        assert_eq!(result as i32, GCReturnCode::Success as i32);
+        assert_eq!(state.enabled, 1);
+        assert_eq!(state.total_tracked, 0);
+        assert_eq!(state.generation_counts, [0; 3]);
+        assert_eq!(state.uncollectable, 0);
+        assert_eq!(state.thresholds, [100, 150, 200]);
+
+        assert_eq!(py_gc_cleanup() as i32, GCReturnCode::Success as i32);
+        let result = unsafe { py_gc_get_state(&mut state) };
+        assert_eq!(result as i32, GCReturnCode::ErrorInternal as i32);
+    }
+
+    #[test]
+    fn test_state_version() {
+        let _guard = serial();
+        assert_eq!(py_gc_init() as i32, GCReturnCode::Success as i32);
+
+        let version = py_gc_state_version();
+        assert_eq!(py_gc_state_version(), version);
+
+        assert_eq!(py_gc_disable() as i32, GCReturnCode::Success as i32);
+        let disabled = py_gc_state_version();
+        assert_ne!(disabled, version);
+
+        assert_eq!(py_gc_collect() as i32, GCReturnCode::Success as i32);
+        assert_ne!(py_gc_state_version(), disabled);
+
+        assert_eq!(py_gc_cleanup() as i32, GCReturnCode::Success as i32);
+    }
+
+    #[test]
+    fn test_self_test() {
+        let _guard = serial();
+        let mut mask = 0u32;
+        let result = unsafe { py_gc_self_test(&mut mask) };
+        assert_eq!(result as i32, GCReturnCode::Success as i32);
+        assert_eq!(mask, (1 << 12) - 1);
+        assert_eq!(py_gc_is_initialized(), 0);
+    }
 
     #[test]
     fn test_gc_init_cleanup() {
+        let _guard = serial();
         assert_eq!(py_gc_init() as i32, GCReturnCode::Success as i32);
         assert_eq!(py_gc_cleanup() as i32, GCReturnCode::Success as i32);
     }
 
     #[test]
     fn test_gc_enable_disable() {
+        let _guard = serial();
         assert_eq!(py_gc_init() as i32, GCReturnCode::Success as i32);
 
         assert_eq!(py_gc_disable() as i32, GCReturnCode::Success as i32);
@@ -1352,6 +2122,7 @@ mod tests {
 
     #[test]
     fn test_gc_collection() {
+        let _guard = serial();
         assert_eq!(py_gc_init() as i32, GCReturnCode::Success as i32);
 
         let result = py_gc_collect();
@@ -1362,6 +2133,7 @@ mod tests {
 
     #[test]
     fn test_finalizer_behavior() {
+        let _guard = serial();
         assert_eq!(py_gc_init() as i32, GCReturnCode::Success as i32);
 
         let obj1 = PyObject::new("regular_obj".to_string(), ObjectData::Integer(42));
@@ -1395,4 +2167,181 @@ mod tests {
 
         assert_eq!(py_gc_cleanup() as i32, GCReturnCode::Success as i32);
     }
+
+    #[test]
+    fn test_track_untrack_python_many() {
+        let _guard = serial();
+        assert_eq!(py_gc_init() as i32, GCReturnCode::Success as i32);
+
+        let mut py_type: PyTypeObject = unsafe { std::mem::zeroed() };
+        py_type.tp_name = c"fake_type".as_ptr();
+        py_type.tp_flags = PY_TPFLAGS_HAVE_GC;
+        let mut heads: Vec<PyObject_HEAD> = (0..4)
+            .map(|_| PyObject_HEAD {
+                ob_refcnt: 1,
+                ob_type: &mut py_type,
+            })
+            .collect();
+        let ptrs: Vec<*mut c_void> = heads
+            .iter_mut()
+            .map(|head| head as *mut PyObject_HEAD as *mut c_void)
+            .collect();
+
+        unsafe {
+            assert_eq!(
+                py_gc_track_python_many(ptrs.as_ptr(), ptrs.len()) as i32,
+                GCReturnCode::Success as i32
+            );
+            assert!(ptrs.iter().all(|&ptr| py_gc_is_tracked(ptr) == 1));
+
+            let mut tracked = [0u8; 4];
+            assert_eq!(
+                py_gc_is_tracked_python_many(ptrs.as_ptr(), ptrs.len(), tracked.as_mut_ptr())
+                    as i32,
+                GCReturnCode::Success as i32
+            );
+            assert_eq!(tracked, [1; 4]);
+
+            let mut name = [0 as c_char; 32];
+            py_gc_get_object_type_name(ptrs[0], name.as_mut_ptr(), name.len());
+            assert_eq!(std::ffi::CStr::from_ptr(name.as_ptr()), c"fake_type");
+
+            assert_eq!(
+                py_gc_track_python_many(ptrs.as_ptr(), ptrs.len()) as i32,
+                GCReturnCode::ErrorAlreadyTracked as i32
+            );
+
+            assert_eq!(
+                py_gc_untrack_python_many(ptrs.as_ptr(), ptrs.len()) as i32,
+                GCReturnCode::Success as i32
+            );
+            assert!(ptrs.iter().all(|&ptr| py_gc_is_tracked(ptr) == 0));
+            py_gc_is_tracked_python_many(ptrs.as_ptr(), ptrs.len(), tracked.as_mut_ptr());
+            assert_eq!(tracked, [0; 4]);
+
+            assert_eq!(
+                py_gc_untrack_python_many(ptrs.as_ptr(), ptrs.len()) as i32,
+                GCReturnCode::ErrorNotTracked as i32
+            );
+        }
+
+        assert_eq!(py_gc_cleanup() as i32, GCReturnCode::Success as i32);
+    }
+
+    #[test]
+    fn test_is_tracked_python_checks_have_gc_flag() {
+        let _guard = serial();
+        assert_eq!(py_gc_init() as i32, GCReturnCode::Success as i32);
+
+        // Py_TPFLAGS_HAVE_GC is bit 14; bit 5 is Py_TPFLAGS_SEQUENCE, which
+        // says nothing about GC support
+        let mut gc_type: PyTypeObject = unsafe { std::mem::zeroed() };
+        gc_type.tp_name = c"gc_type".as_ptr();
+        gc_type.tp_flags = 1 << 14;
+        let mut sequence_type: PyTypeObject = unsafe { std::mem::zeroed() };
+        sequence_type.tp_name = c"sequence_type".as_ptr();
+        sequence_type.tp_flags = 1 << 5;
+
+        let mut gc_obj = PyObject_HEAD {
+            ob_refcnt: 1,
+            ob_type: &mut gc_type,
+        };
+        let mut sequence_obj = PyObject_HEAD {
+            ob_refcnt: 1,
+            ob_type: &mut sequence_type,
+        };
+        let gc_ptr = &mut gc_obj as *mut PyObject_HEAD as *mut c_void;
+        let sequence_ptr = &mut sequence_obj as *mut PyObject_HEAD as *mut c_void;
+
+        unsafe {
+            assert_eq!(
+                py_gc_track_python(gc_ptr) as i32,
+                GCReturnCode::Success as i32
+            );
+            assert_eq!(
+                py_gc_track_python(sequence_ptr) as i32,
+                GCReturnCode::Success as i32
+            );
+
+            assert_eq!(py_gc_is_tracked_python(gc_ptr), 1);
+            assert_eq!(py_gc_is_tracked_python(sequence_ptr), 0);
+
+            py_gc_untrack_python(gc_ptr);
+            py_gc_untrack_python(sequence_ptr);
+        }
+
+        assert_eq!(py_gc_cleanup() as i32, GCReturnCode::Success as i32);
+    }
+
+    #[test]
+    fn test_track_untrack_many() {
+        let _guard = serial();
+        assert_eq!(py_gc_init() as i32, GCReturnCode::Success as i32);
+
+        let ptrs: Vec<*mut c_void> = (0..4)
+            .map(|i| {
+                let obj = PyObject::new(format!("batch_{i}"), ObjectData::Integer(i));
+                Box::into_raw(Box::new(obj)) as *mut c_void
+            })
+            .collect();
+
+        unsafe {
+            assert_eq!(
+                py_gc_track_many(ptrs.as_ptr(), ptrs.len()) as i32,
+                GCReturnCode::Success as i32
+            );
+            assert!(ptrs.iter().all(|&ptr| py_gc_is_tracked(ptr) == 1));
+
+            assert_eq!(
+                py_gc_track_many(ptrs.as_ptr(), ptrs.len()) as i32,
+                GCReturnCode::ErrorAlreadyTracked as i32
+            );
+
+            assert_eq!(
+                py_gc_untrack_many(ptrs.as_ptr(), ptrs.len()) as i32,
+                GCReturnCode::Success as i32
+            );
+            assert!(ptrs.iter().all(|&ptr| py_gc_is_tracked(ptr) == 0));
+
+            assert_eq!(
+                py_gc_untrack_many(ptrs.as_ptr(), ptrs.len()) as i32,
+                GCReturnCode::ErrorNotTracked as i32
+            );
+
+            for ptr in ptrs {
+                let _ = Box::from_raw(ptr as *mut PyObject);
+            }
+        }
+
+        assert_eq!(py_gc_cleanup() as i32, GCReturnCode::Success as i32);
+    }
+
+    #[test]
+    fn test_thresholds_batch() {
+        let _guard = serial();
+        assert_eq!(py_gc_init() as i32, GCReturnCode::Success as i32);
+
+        assert_eq!(
+            py_gc_set_thresholds(100, 150, 200) as i32,
+            GCReturnCode::Success as i32
+        );
+
+        let mut thresholds = [0 as c_int; 3];
+        unsafe {
+            assert_eq!(
+                py_gc_get_thresholds(thresholds.as_mut_ptr()) as i32,
+                GCReturnCode::Success as i32
+            );
+        }
+        assert_eq!(thresholds, [100, 150, 200]);
+        assert_eq!(py_gc_get_threshold(1), 150);
+
+        assert_eq!(
+            py_gc_set_thresholds(1, -1, 1) as i32,
+            GCReturnCode::ErrorInvalidGeneration as i32
+        );
+        assert_eq!(py_gc_get_threshold(0), 100);
+
+        assert_eq!(py_gc_cleanup() as i32, GCReturnCode::Success as i32);
+    }
 }
@@ -4,6 +4,7 @@ use crate::error::GCError;
 use crate::object::{ObjectId, PyObject};
 use parking_lot::RwLock;
 use std::sync::Arc;
+use std::time::{Duration, Instant};
 
 #[derive(Debug)]
 pub struct GarbageCollector {
@@ -11,6 +12,7 @@ pub struct GarbageCollector {
     enabled: bool,
     thresholds: [usize; 3],
     debug_flags: u32,
+    incremental_budget: usize,
 }
 
 unsafe impl Send for GarbageCollector {}
@@ -23,6 +25,7 @@ impl GarbageCollector {
             enabled: true,
             thresholds: [700, 10, 10],
             debug_flags: 0,
+            incremental_budget: 100,
         }
     }
 
@@ -89,6 +92,43 @@ impl GarbageCollector {
         collector.collect_generation(2)
     }
 
+    /// Run increments of a full collection until it finishes or `budget`
+    /// has elapsed.
+    ///
+    /// Each increment collects at most `incremental_budget` objects and holds
+    /// the collector's write lock only for itself, so other callers can get
+    /// in between increments. The clock is only checked between increments.
+    /// Returns `true` while more work remains, and `GCError::Disabled` if the
+    /// collector is disabled.
+    pub fn collect_step(&self, budget: Duration) -> GCResult<bool> {
+        if !self.enabled {
+            return Err(GCError::Disabled);
+        }
+
+        let start = Instant::now();
+
+        loop {
+            let (_, done) = self
+                .collector
+                .write()
+                .collect_step(2, self.incremental_budget)?;
+            if done {
+                return Ok(false);
+            }
+            if start.elapsed() >= budget {
+                return Ok(true);
+            }
+        }
+    }
+
+    pub fn set_incremental_budget(&mut self, objects: usize) {
+        self.incremental_budget = objects.max(1);
+    }
+
+    pub fn get_incremental_budget(&self) -> usize {
+        self.incremental_budget
+    }
+
     pub fn needs_collection(&self) -> bool {
         let collector = self.collector.read();
         collector.generation_manager.should_collect_generation(0)
@@ -264,6 +304,30 @@ mod tests {
         assert_eq!(gc.get_threshold(0), Some(1000));
     }
 
+    #[test]
+    fn test_incremental_collection() {
+        let mut gc = GarbageCollector::new();
+        gc.set_incremental_budget(2);
+
+        let objects = (0..5)
+            .map(|i| PyObject::new(format!("step_{i}"), ObjectData::Integer(i)))
+            .collect();
+        assert!(gc.track_bulk(objects).is_ok());
+
+        // A zero budget stops after the first increment
+        assert!(gc.collect_step(Duration::ZERO).unwrap());
+        assert_eq!(gc.get_count(), 3);
+
+        assert!(!gc.collect_step(Duration::from_secs(1)).unwrap());
+        assert_eq!(gc.get_count(), 0);
+
+        gc.disable();
+        assert!(matches!(
+            gc.collect_step(Duration::from_secs(1)),
+            Err(GCError::Disabled)
+        ));
+    }
+
     #[test]
     fn test_collection() {
         let gc = GarbageCollector::new();